@@ -0,0 +1,147 @@
+"""Local stand-in for the celinksmart open API used by the benchmarks.
+
+Serves the device list and device info endpoints from a recorded
+devices/info payload, cloned once per simulated device. Responses are
+rendered ahead of each cycle so the server adds as little as possible
+to the measured time; latency and errors are injected per request.
+"""
+from __future__ import annotations
+
+import asyncio
+import copy
+import json
+import random
+from typing import Any
+
+from aiohttp import web
+
+# Properties whose value moves between cycles, like a live system
+_LIVE_PROPERTIES = {
+    "Pv1Power",
+    "Pv2Power",
+    "RPower",
+    "BatteryPower",
+    "GenerationPower",
+    "TotalLoadPower",
+    "GridTotalPower",
+    "TotalActivePower",
+    "SystemProductionTotalPower",
+}
+
+
+class FakeHinenApi:
+    """Serves recorded payloads for a fleet of simulated devices."""
+
+    def __init__(
+        self,
+        payload: dict[str, Any],
+        devices: int,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        """Initialize the fake API."""
+        self._payload = payload
+        self.device_ids = [str(int(payload.get("id", 1000000)) + n) for n in range(devices)]
+        self.latency = latency
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._clock_ms = max(
+            (int(prop.get("timestamp") or 0) for prop in payload.get("properties", [])),
+            default=0,
+        )
+        self._device_list = b""
+        self._device_info: dict[str, bytes] = {}
+        self.calls: dict[str, int] = {"devices": 0, "info": 0, "property_set": 0, "errors": 0}
+        self.bytes_sent = 0
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+        self.advance(0)
+
+    async def start(self) -> None:
+        """Start serving on a free local port."""
+        app = web.Application()
+        app.router.add_get("/iot-device/open-api/devices", self._handle_devices)
+        app.router.add_get(
+            "/iot-device/open-api/devices/info/{device_id}", self._handle_info
+        )
+        app.router.add_put(
+            "/iot-device/open-api/devices/property_set", self._handle_property_set
+        )
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+        self.url = f"http://127.0.0.1:{port}"
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    def advance(self, seconds: float) -> None:
+        """Move the device clock and render the responses of the next cycle.
+
+        With seconds=0 the devices report the same timestamps again, as
+        when a poll comes before the next upload.
+        """
+        self._clock_ms += int(seconds * 1000)
+        self._device_list = self._render(
+            [
+                {
+                    "id": device_id,
+                    "deviceName": f"{self._payload.get('deviceName', 'Device')} {n}",
+                    "serialNumber": f"BENCH{n:06d}",
+                }
+                for n, device_id in enumerate(self.device_ids)
+            ]
+        )
+        for n, device_id in enumerate(self.device_ids):
+            info = copy.deepcopy(self._payload)
+            info["id"] = device_id
+            info["deviceName"] = f"{info.get('deviceName', 'Device')} {n}"
+            info["serialNumber"] = f"BENCH{n:06d}"
+            for prop in info.get("properties", []):
+                if seconds and prop.get("identifier") in _LIVE_PROPERTIES:
+                    value = float(prop.get("value") or 0)
+                    prop["value"] = str(round(value * self._random.uniform(0.8, 1.2), 1))
+                prop["timestamp"] = self._clock_ms
+            self._device_info[device_id] = self._render(info)
+
+    @staticmethod
+    def _render(data: Any) -> bytes:
+        """Render a successful API response."""
+        return json.dumps({"code": "00000", "msg": "success", "data": data}).encode()
+
+    async def _respond(self, body: bytes) -> web.Response:
+        """Apply latency and errors, then send a rendered response."""
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.calls["errors"] += 1
+            return web.Response(status=503, text="Service Unavailable")
+        self.bytes_sent += len(body)
+        return web.Response(body=body, content_type="application/json")
+
+    async def _handle_devices(self, request: web.Request) -> web.Response:
+        """Serve the device list."""
+        self.calls["devices"] += 1
+        return await self._respond(self._device_list)
+
+    async def _handle_info(self, request: web.Request) -> web.Response:
+        """Serve the info of one device."""
+        self.calls["info"] += 1
+        body = self._device_info.get(request.match_info["device_id"])
+        if body is None:
+            return web.Response(
+                body=json.dumps({"code": "A0400", "msg": "device not found"}).encode(),
+                content_type="application/json",
+            )
+        return await self._respond(body)
+
+    async def _handle_property_set(self, request: web.Request) -> web.Response:
+        """Accept a property write."""
+        self.calls["property_set"] += 1
+        await request.read()
+        return await self._respond(self._render(None))
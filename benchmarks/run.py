@@ -0,0 +1,352 @@
+"""Benchmark a poll cycle of the Hinen Solar coordinator and entity pipeline.
+
+Runs the real HinenApiClient, coordinators and entity platforms against
+a local stand-in for the celinksmart API (see fake_api.py) and reports,
+per device count, the wall time of a poll cycle, memory allocated
+during a cycle, API calls and entity state writes.
+
+Needs a Home Assistant development environment (pip install
+homeassistant). Example:
+
+    python benchmarks/run.py --devices 1 10 100 --cycles 20 --latency 0.02
+    python benchmarks/run.py --json bench_results.jsonl
+
+With --json every run is appended as one JSON line, so results from
+different commits can be compared.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.hinen import (  # noqa: E402
+    binary_sensor,
+    number,
+    ratelimit,
+    select,
+    sensor,
+    switch,
+)
+from custom_components.hinen import api as api_module  # noqa: E402
+from custom_components.hinen.api import HinenApiClient  # noqa: E402
+from custom_components.hinen.const import DOMAIN  # noqa: E402
+from custom_components.hinen.coordinator import HinenDataUpdateCoordinator  # noqa: E402
+from fake_api import FakeHinenApi  # noqa: E402
+
+PLATFORMS = (sensor, binary_sensor, number, select, switch)
+# Entity attributes read when a state is written, in order of preference
+STATE_ATTRIBUTES = ("native_value", "is_on", "current_option")
+CLIENT_ID = "benchmark"
+# Device clock step between cycles, so every cycle carries new data
+CYCLE_SECONDS = 60
+
+
+class BenchmarkEntry:
+    """The parts of a config entry the integration uses."""
+
+    def __init__(self, concurrency: int) -> None:
+        """Initialize the entry."""
+        self.entry_id = "benchmark"
+        self.data: dict[str, Any] = {}
+        # Polls are driven by the benchmark, keep the schedulers out of the way
+        self.options = {
+            "max_concurrent_requests": concurrency,
+            "scan_interval": 86400,
+            "adaptive_polling": False,
+            "phase_aligned_polling": False,
+        }
+        self._on_unload: list[Any] = []
+
+    def async_on_unload(self, func: Any) -> None:
+        """Remember a function to call when the benchmark ends."""
+        self._on_unload.append(func)
+
+    def unload(self) -> None:
+        """Call the unload functions."""
+        while self._on_unload:
+            self._on_unload.pop()()
+
+
+class WriteCounter:
+    """Counts entity state writes and reads the state like a write would."""
+
+    def __init__(self) -> None:
+        """Initialize the counter."""
+        self.writes = 0
+        self.entities: list[Any] = []
+
+    def add_entities(self, entities: list[Any], update_before_add: bool = False) -> None:
+        """Stand in for AddEntitiesCallback."""
+        for entity in entities:
+            entity.async_write_ha_state = self._writer(entity)
+            # What CoordinatorEntity.async_added_to_hass does
+            entity.coordinator.async_add_listener(
+                entity._handle_coordinator_update, entity.coordinator_context
+            )
+            self.entities.append(entity)
+
+    def _writer(self, entity: Any) -> Any:
+        """Return a state writer for an entity."""
+        attribute = next(
+            (name for name in STATE_ATTRIBUTES if hasattr(type(entity), name)), None
+        )
+
+        def _write() -> None:
+            self.writes += 1
+            state = (
+                entity.available,
+                getattr(entity, attribute) if attribute else None,
+                entity.extra_state_attributes,
+            )
+            del state
+
+        return _write
+
+
+def git_revision() -> str | None:
+    """Return the current commit, if the tree is a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def async_run_scenario(
+    devices: int, args: argparse.Namespace, payload: dict[str, Any]
+) -> dict[str, Any]:
+    """Run the poll cycles for one device count and return the results."""
+    server = FakeHinenApi(
+        payload, devices, latency=args.latency, error_rate=args.error_rate, seed=args.seed
+    )
+    await server.start()
+
+    if not args.rate_limit:
+        # Measure the pipeline, not the client-side request budget
+        ratelimit._LIMITERS[(server.url, CLIENT_ID)] = ratelimit.TokenBucket(1e9, 10**9)
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        session = aiohttp.ClientSession()
+        api = HinenApiClient(
+            session=session,
+            client_id=CLIENT_ID,
+            client_secret="secret",
+            region_code="AU",
+            access_token="token",
+            refresh_token="refresh",
+            host=server.url,
+            token_expiration=datetime.now() + timedelta(days=1),
+        )
+        entry = BenchmarkEntry(args.concurrency)
+        fleet = HinenDataUpdateCoordinator(hass, api, entry)  # type: ignore[arg-type]
+        await fleet.async_load_energy()
+        await fleet.async_refresh()
+
+        hass.data.setdefault(DOMAIN, {})[entry.entry_id] = fleet
+        counter = WriteCounter()
+        for platform in PLATFORMS:
+            await platform.async_setup_entry(hass, entry, counter.add_entities)
+
+        async def async_cycle() -> tuple[float, float, dict[str, int], int]:
+            """Poll every device once.
+
+            Returns wall time, CPU time, API calls and entity writes. CPU
+            time includes the request handling of the stand-in server.
+            """
+            server.advance(0 if args.unchanged else CYCLE_SECONDS)
+            calls = dict(server.calls)
+            writes = counter.writes
+            start = time.perf_counter()
+            cpu_start = time.process_time()
+            await asyncio.gather(
+                *(
+                    coordinator.async_refresh()
+                    for coordinator in fleet.device_coordinators.values()
+                )
+            )
+            cpu = time.process_time() - cpu_start
+            wall = time.perf_counter() - start
+            delta = {key: server.calls[key] - calls[key] for key in calls}
+            return wall, cpu, delta, counter.writes - writes
+
+        for _ in range(args.warmup):
+            await async_cycle()
+
+        walls: list[float] = []
+        cpus: list[float] = []
+        calls: list[dict[str, int]] = []
+        writes: list[int] = []
+        for _ in range(args.cycles):
+            wall, cpu, delta, written = await async_cycle()
+            walls.append(wall)
+            cpus.append(cpu)
+            calls.append(delta)
+            writes.append(written)
+
+        # Allocations are traced in separate cycles, tracing skews wall time
+        allocated: list[int] = []
+        for _ in range(args.alloc_cycles):
+            tracemalloc.start()
+            await async_cycle()
+            allocated.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+        entities = len(counter.entities)
+        # Mean parse time summed over the devices of a cycle
+        parse_ms = [
+            sum(
+                coordinator.parse_histogram.total / coordinator.parse_histogram.count
+                for coordinator in fleet.device_coordinators.values()
+                if coordinator.parse_histogram.count
+            )
+            * 1000
+        ]
+        resilience = api.resilience_stats
+        entry.unload()
+        await fleet.async_shutdown()
+        api.shutdown()
+        await session.close()
+        await hass.async_stop(force=True)
+    await server.stop()
+
+    walls_ms = sorted(wall * 1000 for wall in walls)
+    return {
+        "devices": devices,
+        "entities": entities,
+        "cycles": args.cycles,
+        "wall_ms_mean": statistics.fmean(walls_ms),
+        "wall_ms_p50": statistics.median(walls_ms),
+        "wall_ms_max": walls_ms[-1],
+        "wall_ms_per_device": statistics.fmean(walls_ms) / devices,
+        "cpu_ms_mean": statistics.fmean(cpus) * 1000,
+        "parse_ms_mean": statistics.fmean(parse_ms) if parse_ms else None,
+        "alloc_kib_peak": (max(allocated) / 1024) if allocated else None,
+        "api_calls_per_cycle": statistics.fmean(sum(delta.values()) for delta in calls),
+        "api_errors_per_cycle": statistics.fmean(delta["errors"] for delta in calls),
+        "entity_writes_per_cycle": statistics.fmean(writes),
+        "retries": resilience.get("retries"),
+    }
+
+
+def print_table(results: list[dict[str, Any]]) -> None:
+    """Print results as a table."""
+    columns = (
+        ("devices", "devices", "{}"),
+        ("entities", "entities", "{}"),
+        ("wall_ms_mean", "wall ms", "{:.2f}"),
+        ("wall_ms_p50", "p50 ms", "{:.2f}"),
+        ("wall_ms_max", "max ms", "{:.2f}"),
+        ("wall_ms_per_device", "ms/device", "{:.3f}"),
+        ("cpu_ms_mean", "CPU ms", "{:.2f}"),
+        ("parse_ms_mean", "parse ms", "{:.2f}"),
+        ("alloc_kib_peak", "alloc KiB", "{:.1f}"),
+        ("api_calls_per_cycle", "API calls", "{:.1f}"),
+        ("entity_writes_per_cycle", "writes", "{:.1f}"),
+    )
+    rows = [
+        [
+            "-" if result[key] is None else fmt.format(result[key])
+            for key, _, fmt in columns
+        ]
+        for result in results
+    ]
+    widths = [
+        max(len(title), *(len(row[n]) for row in rows))
+        for n, (_, title, _) in enumerate(columns)
+    ]
+    print("  ".join(title.rjust(width) for (_, title, _), width in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(cell.rjust(width) for cell, width in zip(row, widths)))
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--alloc-cycles", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of HTTP 503s")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--unchanged",
+        action="store_true",
+        help="devices report the same timestamps every cycle",
+    )
+    parser.add_argument(
+        "--stdlib-json",
+        action="store_true",
+        help="decode responses with the stdlib json module instead of orjson",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        action="store_true",
+        help="keep the client-side rate limiter enabled",
+    )
+    parser.add_argument(
+        "--payload",
+        type=Path,
+        default=Path(__file__).resolve().parent / "payloads" / "device_info.json",
+        help="recorded devices/info data object to serve",
+    )
+    parser.add_argument("--json", type=Path, help="append results to this JSON lines file")
+    return parser.parse_args()
+
+
+async def async_main(args: argparse.Namespace) -> None:
+    """Run every scenario and report."""
+    payload = json.loads(args.payload.read_text())
+    if args.stdlib_json:
+        # Compare against the decoder used before the orjson path
+        api_module.json_loads = json.loads
+    results = [
+        await async_run_scenario(devices, args, payload) for devices in args.devices
+    ]
+    print_table(results)
+
+    if args.json:
+        record = {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": sys.version.split()[0],
+            "options": {
+                key: str(value) if isinstance(value, Path) else value
+                for key, value in vars(args).items()
+                if key != "json"
+            },
+            "results": results,
+        }
+        with args.json.open("a") as file:
+            file.write(json.dumps(record) + "\n")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(async_main(parse_args()))
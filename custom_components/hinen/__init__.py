@@ -2,27 +2,59 @@
 from __future__ import annotations
 
 import logging
-from datetime import timedelta
+from datetime import datetime, timedelta
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.debounce import Debouncer
 
 from .api import HinenApiClient
 from .coordinator import HinenDataUpdateCoordinator
-from .const import DOMAIN
+from .const import DOMAIN, HOSTS, TOKEN_SAVE_COOLDOWN
+from .statistics import StatisticsImporter
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.BINARY_SENSOR]
+PLATFORMS: list[Platform] = [
+    Platform.SENSOR,
+    Platform.BINARY_SENSOR,
+    Platform.NUMBER,
+    Platform.SELECT,
+    Platform.SWITCH,
+]
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Hinen Solar from a config entry."""
     session = async_get_clientsession(hass)
 
+    @callback
+    def _async_save_tokens() -> None:
+        """Write the client's current credentials back to the entry."""
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, **api.token_data}
+        )
+
+    # Coalesce token writes so refresh bursts do not churn storage
+    token_saver = Debouncer(
+        hass,
+        _LOGGER,
+        cooldown=TOKEN_SAVE_COOLDOWN,
+        immediate=True,
+        function=_async_save_tokens,
+    )
+
+    @callback
+    def _async_tokens_updated(tokens: dict[str, Any]) -> None:
+        """Schedule a save of refreshed credentials."""
+        hass.async_create_task(token_saver.async_call())
+
+    token_expiration = entry.data.get("token_expiration")
+
     api = HinenApiClient(
         session=session,
         client_id=entry.data["client_id"],
@@ -31,30 +63,75 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         access_token=entry.data.get("access_token"),
         refresh_token=entry.data.get("refresh_token"),
         host=entry.data.get("host"),
+        token_expiration=(
+            datetime.fromtimestamp(token_expiration) if token_expiration else None
+        ),
+        token_update_callback=_async_tokens_updated,
+        proactive_renewal=True,
+        extra_hosts=_extra_hosts(entry),
     )
 
+    @callback
+    def _async_flush_tokens() -> None:
+        """Save any pending credentials when the entry is unloaded."""
+        token_saver.async_cancel()
+        _async_save_tokens()
+
+    entry.async_on_unload(_async_flush_tokens)
+    entry.async_on_unload(api.shutdown)
+
     try:
-        # Verify authentication by fetching devices
+        # Verify authentication by fetching devices (also primes the device cache)
         await api.async_get_devices()
     except Exception as err:
         _LOGGER.error("Error communicating with API: %s", err)
         raise ConfigEntryNotReady from err
 
-    coordinator = HinenDataUpdateCoordinator(hass, api)
+    coordinator = HinenDataUpdateCoordinator(hass, api, entry)
+    await coordinator.async_load_energy()
 
     await coordinator.async_config_entry_first_refresh()
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
+    # Backfill hourly energy statistics, resuming where the last run stopped
+    importer = StatisticsImporter(hass, entry, coordinator)
+    await importer.async_start()
+    entry.async_on_unload(importer.async_stop)
+
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     return True
 
 
+def _extra_hosts(entry: ConfigEntry) -> list[str]:
+    """Return the hosts of the additional data centers chosen in the options."""
+    return [
+        HOSTS[data_center]
+        for data_center in entry.options.get("additional_data_centers", [])
+        if data_center in HOSTS
+    ]
+
+
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply updated options to the running coordinator."""
+    coordinator: HinenDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    if entry.options == coordinator.applied_options:
+        # Only the entry data changed, e.g. refreshed tokens were saved
+        return
+    coordinator.applied_options = dict(entry.options)
+    await coordinator.async_apply_options()
+    if coordinator.api.set_extra_hosts(_extra_hosts(entry)):
+        await coordinator.async_refresh_device_list()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator: HinenDataUpdateCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_shutdown()
 
     return unload_ok
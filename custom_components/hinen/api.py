@@ -1,22 +1,89 @@
 """API client for Hinen Solar."""
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+from collections.abc import Callable
 from typing import Any
 from datetime import datetime, timedelta
 
 import aiohttp
 from aiohttp import ClientSession, ClientResponseError
 
+try:
+    # orjson backed, decodes the response bytes directly
+    from homeassistant.util.json import json_loads
+except ImportError:
+    from json import loads as json_loads
+
 from .const import (
+    DEFAULT_DEVICE_LIST_TTL,
     GRANT_TYPE_AUTHORIZATION_CODE,
     GRANT_TYPE_REFRESH_TOKEN,
     OAUTH_TOKEN_URL,
+    REQUEST_MAX_RETRIES,
+    REQUEST_TIMEOUT,
+    RETRYABLE_API_CODES,
+    TOKEN_EXPIRY_MARGIN,
+    TOKEN_RENEWAL_LEAD,
+    TOKEN_RENEWAL_RETRY,
 )
 
+from .metrics import ApiMetrics, EndpointStats
+from .ratelimit import get_rate_limiter
+from .resilience import CircuitBreaker, backoff_delay
+
 _LOGGER = logging.getLogger(__name__)
 
 
+class HinenApiError(Exception):
+    """Error returned by or while talking to the Hinen API."""
+
+
+class HinenTransientError(HinenApiError):
+    """Error that is expected to clear up when the request is retried."""
+
+
+class HinenCircuitOpenError(HinenApiError):
+    """Request rejected because the API is considered down."""
+
+
+class HinenWriteError(HinenApiError):
+    """Property write that the device did not confirm."""
+
+
+def _is_retryable_code(code: str | None) -> bool:
+    """Return True if an API result code asks the caller to retry."""
+    if not isinstance(code, str) or not code:
+        return False
+    return code in RETRYABLE_API_CODES or code[0] in "BC"
+
+
+def _check_result(data: dict[str, Any], stats: EndpointStats, failure: str) -> None:
+    """Raise if a decoded response carries an error result code."""
+    code = data.get("code")
+    if code != "00000":
+        stats.errors += 1
+        if _is_retryable_code(code):
+            raise HinenTransientError(f"API busy ({code}): {data.get('msg')}")
+        raise HinenApiError(f"{failure}: {data.get('msg')}")
+
+
+def _token_payload(data: dict[str, Any]) -> dict[str, Any]:
+    """Return the token data object of a successful token response."""
+    if not isinstance(payload := data.get("data"), dict):
+        raise HinenApiError("Token response has no token data")
+    return payload
+
+
+def _endpoint_name(endpoint: str) -> str:
+    """Return the metrics name of an API path."""
+    if "/devices/info/" in endpoint:
+        return "devices/info"
+    return endpoint.rsplit("/", 1)[-1]
+
+
 class HinenApiClient:
     """API client for Hinen Solar."""
 
@@ -29,8 +96,18 @@ class HinenApiClient:
         access_token: str | None = None,
         refresh_token: str | None = None,
         host: str | None = None,
+        token_expiration: datetime | None = None,
+        token_update_callback: Callable[[dict[str, Any]], None] | None = None,
+        device_list_ttl: float = DEFAULT_DEVICE_LIST_TTL,
+        proactive_renewal: bool = False,
+        extra_hosts: list[str] | None = None,
     ) -> None:
-        """Initialize the API client."""
+        """Initialize the API client.
+
+        The token response names the account's home host. Devices listed
+        on extra_hosts (other data centers) are fetched with the same
+        credentials and routed to the host that listed them.
+        """
         self._session = session
         self._client_id = client_id
         self._client_secret = client_secret
@@ -38,7 +115,34 @@ class HinenApiClient:
         self._access_token = access_token
         self._refresh_token = refresh_token
         self._host = host
-        self._token_expiration: datetime | None = None
+        self._extra_hosts = list(extra_hosts or [])
+        self._token_expiration = token_expiration
+        self._token_update_callback = token_update_callback
+
+        # Single in-flight token refresh shared by concurrent callers
+        self._refresh_task: asyncio.Task[dict[str, Any]] | None = None
+        # Background renewal ahead of expiry, only for long-lived clients
+        self._proactive_renewal = proactive_renewal
+        self._renewal_handle: asyncio.TimerHandle | None = None
+
+        # Device inventory cache, refreshed once per device_list_ttl
+        self.device_list_ttl = device_list_ttl
+        self._devices: list[dict[str, Any]] | None = None
+        self._devices_fetched_at: float | None = None
+        # Host that listed each device, and the last device list of each host
+        self._device_hosts: dict[str, str | None] = {}
+        self._host_devices: dict[str, list[dict[str, Any]]] = {}
+
+        # Resilience state, exposed through resilience_stats
+        # One breaker per host, so an outage in one data center does not
+        # stop requests to the others
+        self._breakers: dict[str | None, CircuitBreaker] = {}
+        self._timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        self.request_count = 0
+        self.retry_count = 0
+        self.failure_count = 0
+        # Latency, response size and error counters per endpoint
+        self.metrics = ApiMetrics()
 
     async def async_get_access_token(
         self, authorization_code: str
@@ -50,35 +154,32 @@ class HinenApiClient:
             "regionCode": self._region_code,
             "authorizationCode": authorization_code,
         }
+        stats = self.metrics.endpoint("token")
+        data = await self._async_read(
+            stats,
+            self._session.get(OAUTH_TOKEN_URL, params=params, timeout=self._timeout),
+        )
+        _check_result(data, stats, "Token request failed")
 
-        async with self._session.get(
-            OAUTH_TOKEN_URL, params=params
-        ) as response:
-            response.raise_for_status()
-            data = await response.json()
-
-            if data.get("code") != "00000":
-                raise Exception(f"Token request failed: {data.get('msg')}")
-
-            token_data = data["data"]
-            self._access_token = token_data["accessToken"]
-            self._refresh_token = token_data["refreshToken"]
-            self._host = token_data["host"]
+        return self._store_token_data(_token_payload(data))
 
-            # Set expiration time
-            expires_in = token_data.get("expiresIn", 3600)
-            self._token_expiration = datetime.now() + timedelta(seconds=expires_in - 300)  # 5 min buffer
+    async def async_refresh_access_token(self) -> dict[str, Any]:
+        """Refresh the access token.
 
-            return {
-                "access_token": self._access_token,
-                "refresh_token": self._refresh_token,
-                "host": self._host,
-            }
+        Concurrent callers share a single in-flight refresh so the refresh
+        token is only ever redeemed once.
+        """
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.get_running_loop().create_task(
+                self._async_refresh_access_token()
+            )
+        # Shield so a cancelled caller does not abort the shared refresh
+        return await asyncio.shield(self._refresh_task)
 
-    async def async_refresh_access_token(self) -> dict[str, Any]:
-        """Refresh the access token."""
+    async def _async_refresh_access_token(self) -> dict[str, Any]:
+        """Perform the token refresh request."""
         if not self._refresh_token:
-            raise Exception("No refresh token available")
+            raise HinenApiError("No refresh token available")
 
         params = {
             "clientSecret": self._client_secret,
@@ -86,71 +187,336 @@ class HinenApiClient:
             "regionCode": self._region_code,
             "refreshToken": self._refresh_token,
         }
+        # Errors are classified like any request, so a refresh that times
+        # out or is throttled is retried and counts against the breaker
+        stats = self.metrics.endpoint("token")
+        data = await self._async_read(
+            stats,
+            self._session.get(OAUTH_TOKEN_URL, params=params, timeout=self._timeout),
+        )
+        _check_result(data, stats, "Token refresh failed")
 
-        async with self._session.get(
-            OAUTH_TOKEN_URL, params=params
-        ) as response:
-            response.raise_for_status()
-            data = await response.json()
+        return self._store_token_data(_token_payload(data))
 
-            if data.get("code") != "00000":
-                raise Exception(f"Token refresh failed: {data.get('msg')}")
+    async def _async_read(self, stats: EndpointStats, request: Any) -> dict[str, Any]:
+        """Send a request and decode its JSON object body.
 
-            token_data = data["data"]
-            self._access_token = token_data["accessToken"]
-            self._refresh_token = token_data["refreshToken"]
-            self._host = token_data["host"]
+        Timeouts, connection errors and 5xx/429 responses raise
+        HinenTransientError; other failures raise HinenApiError.
+        """
+        start = time.monotonic()
+        try:
+            async with request as response:
+                response.raise_for_status()
+                body = await response.read()
+                data = json_loads(body)
+        except ValueError as err:
+            stats.errors += 1
+            raise HinenApiError(f"Invalid JSON response: {err}") from err
+        except ClientResponseError as err:
+            stats.errors += 1
+            if err.status == 429 or err.status >= 500:
+                raise HinenTransientError(f"HTTP {err.status}: {err.message}") from err
+            raise HinenApiError(f"HTTP {err.status}: {err.message}") from err
+        except (asyncio.TimeoutError, aiohttp.ClientError) as err:
+            stats.errors += 1
+            raise HinenTransientError(
+                f"{type(err).__name__}: {err}" if str(err) else type(err).__name__
+            ) from err
+        finally:
+            stats.latency.observe(time.monotonic() - start)
+        stats.response_bytes += len(body)
+        stats.last_response_bytes = len(body)
 
-            # Set expiration time
-            expires_in = token_data.get("expiresIn", 3600)
-            self._token_expiration = datetime.now() + timedelta(seconds=expires_in - 300)
+        if not isinstance(data, dict):
+            stats.errors += 1
+            raise HinenApiError(f"Unexpected response: {type(data).__name__}")
+        return data
 
-            return {
-                "access_token": self._access_token,
-                "refresh_token": self._refresh_token,
-                "host": self._host,
-            }
+    def _store_token_data(self, token_data: dict[str, Any]) -> dict[str, Any]:
+        """Store tokens from a token response and schedule renewal."""
+        self._access_token = token_data["accessToken"]
+        self._refresh_token = token_data["refreshToken"]
+        self._host = token_data["host"]
+
+        # Set expiration time
+        expires_in = token_data.get("expiresIn", 3600)
+        self._token_expiration = datetime.now() + timedelta(
+            seconds=expires_in - TOKEN_EXPIRY_MARGIN
+        )
+        self._schedule_token_renewal()
+
+        tokens = self.token_data
+        if self._token_update_callback is not None:
+            self._token_update_callback(tokens)
+        return tokens
+
+    @property
+    def token_data(self) -> dict[str, Any]:
+        """Return the current credentials in config entry format."""
+        return {
+            "access_token": self._access_token,
+            "refresh_token": self._refresh_token,
+            "host": self._host,
+            "token_expiration": (
+                self._token_expiration.timestamp()
+                if self._token_expiration
+                else None
+            ),
+        }
+
+    def _schedule_token_renewal(self, delay: float | None = None) -> None:
+        """Schedule a background token refresh ahead of expiry."""
+        if self._renewal_handle is not None:
+            self._renewal_handle.cancel()
+            self._renewal_handle = None
+
+        if not self._proactive_renewal or self._token_expiration is None:
+            return
+
+        if delay is None:
+            delay = (
+                self._token_expiration - datetime.now()
+            ).total_seconds() - TOKEN_RENEWAL_LEAD
+
+        self._renewal_handle = asyncio.get_running_loop().call_later(
+            max(delay, 0), self._start_token_renewal
+        )
+
+    def _start_token_renewal(self) -> None:
+        """Start the background token refresh."""
+        self._renewal_handle = None
+        _LOGGER.debug("Renewing access token ahead of expiry")
+        task = asyncio.ensure_future(self.async_refresh_access_token())
+        task.add_done_callback(self._token_renewal_done)
+
+    def _token_renewal_done(self, task: asyncio.Future[dict[str, Any]]) -> None:
+        """Handle the outcome of a background token refresh."""
+        if task.cancelled():
+            return
+        if (err := task.exception()) is not None:
+            _LOGGER.warning(
+                "Background token renewal failed, retrying in %ss: %s",
+                TOKEN_RENEWAL_RETRY,
+                err,
+            )
+            self._schedule_token_renewal(TOKEN_RENEWAL_RETRY)
+
+    def shutdown(self) -> None:
+        """Stop background token renewal."""
+        self._proactive_renewal = False
+        if self._renewal_handle is not None:
+            self._renewal_handle.cancel()
+            self._renewal_handle = None
 
     async def _ensure_valid_token(self) -> None:
         """Ensure we have a valid access token."""
-        if self._token_expiration and datetime.now() >= self._token_expiration:
+        if self._token_expiration is None:
+            # Expiry unknown (entry created before it was persisted), so
+            # refresh up front rather than let the first request fail
+            if self._proactive_renewal and self._refresh_token:
+                _LOGGER.debug("Token expiry unknown, refreshing...")
+                await self.async_refresh_access_token()
+            return
+
+        if datetime.now() >= self._token_expiration:
             _LOGGER.debug("Token expired, refreshing...")
             await self.async_refresh_access_token()
+        elif (
+            self._proactive_renewal
+            and self._renewal_handle is None
+            and (self._refresh_task is None or self._refresh_task.done())
+        ):
+            # Expiry was restored from the config entry
+            self._schedule_token_renewal()
+
+    @property
+    def hosts(self) -> list[str | None]:
+        """Return the home host followed by the extra hosts."""
+        return [self._host] + [host for host in self._extra_hosts if host != self._host]
+
+    def set_extra_hosts(self, extra_hosts: list[str]) -> bool:
+        """Change the extra hosts; return True if they changed."""
+        if extra_hosts == self._extra_hosts:
+            return False
+        self._extra_hosts = list(extra_hosts)
+        self.invalidate_device_cache()
+        return True
+
+    def _get_breaker(self, host: str | None) -> CircuitBreaker:
+        """Return the circuit breaker of a host."""
+        if (breaker := self._breakers.get(host)) is None:
+            breaker = self._breakers[host] = CircuitBreaker()
+        return breaker
+
+    @property
+    def resilience_stats(self) -> dict[str, Any]:
+        """Return request, retry and circuit breaker counters."""
+        breaker = self._get_breaker(self._host)
+        stats = {
+            "requests": self.request_count,
+            "retries": self.retry_count,
+            "failures": self.failure_count,
+            "circuit_state": breaker.state,
+            "circuit_opened": breaker.times_opened,
+            "consecutive_failures": breaker.consecutive_failures,
+            "circuit_retry_after": round(breaker.retry_after, 1),
+        }
+        if self._extra_hosts:
+            stats["circuit_states"] = {
+                host: self._get_breaker(host).state for host in self.hosts
+            }
+        return stats
+
+    @property
+    def rate_limit_stats(self) -> dict[str, Any]:
+        """Return the shared rate limiter counters for the current host."""
+        if not self._host:
+            return {}
+        return get_rate_limiter(self._host, self._client_id).stats
 
     async def _async_request(
-        self, method: str, endpoint: str, **kwargs
+        self, method: str, endpoint: str, host: str | None = None, **kwargs
+    ) -> dict[str, Any]:
+        """Make an authenticated API request to a host, by default the home host.
+
+        Transient failures (timeouts, connection errors, 5xx/429 responses
+        and throttling result codes) are retried with jittered exponential
+        backoff while the host's circuit breaker allows it.
+        """
+        attempt = 0
+        while True:
+            breaker = self._get_breaker(host or self._host)
+            if not breaker.allow_request():
+                self.failure_count += 1
+                raise HinenCircuitOpenError(
+                    "API temporarily unavailable, next attempt in "
+                    f"{breaker.retry_after:.0f}s"
+                )
+
+            self.request_count += 1
+            try:
+                data = await self._async_request_once(method, endpoint, host, **kwargs)
+            except HinenTransientError as err:
+                breaker.record_failure()
+                if attempt >= REQUEST_MAX_RETRIES:
+                    self.failure_count += 1
+                    raise
+                delay = backoff_delay(attempt)
+                attempt += 1
+                self.retry_count += 1
+                self.metrics.endpoint(_endpoint_name(endpoint)).retries += 1
+                _LOGGER.debug(
+                    "%s %s failed (%s), retry %d/%d in %.1fs",
+                    method,
+                    endpoint,
+                    err,
+                    attempt,
+                    REQUEST_MAX_RETRIES,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+                continue
+            except HinenApiError:
+                # The API answered, so it is up even if the request was bad
+                breaker.record_success()
+                self.failure_count += 1
+                raise
+
+            breaker.record_success()
+            return data
+
+    async def _async_request_once(
+        self, method: str, endpoint: str, host: str | None = None, **kwargs
     ) -> dict[str, Any]:
-        """Make an authenticated API request."""
+        """Make a single authenticated API request attempt."""
         await self._ensure_valid_token()
 
-        if not self._host or not self._access_token:
-            raise Exception("Not authenticated")
+        # Resolved after the token check, a refresh may move the home host
+        host = host or self._host
+        if not host or not self._access_token:
+            raise HinenApiError("Not authenticated")
 
-        url = f"{self._host}{endpoint}"
-        headers = kwargs.pop("headers", {})
+        url = f"{host}{endpoint}"
+        headers = dict(kwargs.pop("headers", {}))
         headers["Authorization"] = self._access_token
 
-        async with self._session.request(
-            method, url, headers=headers, **kwargs
-        ) as response:
-            response.raise_for_status()
-            data = await response.json()
+        waited = await get_rate_limiter(host, self._client_id).acquire()
+        if waited > 1:
+            _LOGGER.debug("Rate limiter delayed %s %s by %.1fs", method, endpoint, waited)
 
-            if data.get("code") != "00000":
-                raise Exception(f"API request failed: {data.get('msg')}")
+        stats = self.metrics.endpoint(_endpoint_name(endpoint))
+        data = await self._async_read(
+            stats,
+            self._session.request(
+                method, url, headers=headers, timeout=self._timeout, **kwargs
+            ),
+        )
+        _check_result(data, stats, "API request failed")
 
-            return data.get("data")
+        return data.get("data")
 
-    async def async_get_devices(self) -> list[dict[str, Any]]:
-        """Get list of devices."""
-        return await self._async_request(
-            "GET", "/iot-device/open-api/devices"
+    async def async_get_devices(
+        self, force_refresh: bool = False
+    ) -> list[dict[str, Any]]:
+        """Get list of devices, served from cache while it is fresh."""
+        if (
+            not force_refresh
+            and self._devices is not None
+            and self._devices_fetched_at is not None
+            and time.monotonic() - self._devices_fetched_at < self.device_list_ttl
+        ):
+            return self._devices
+
+        # None is the home host, resolved per request as a token refresh may
+        # move it. All data centers are listed concurrently, one round trip.
+        hosts: list[str | None] = [None, *self.hosts[1:]]
+        results = await asyncio.gather(
+            *(
+                self._async_request("GET", "/iot-device/open-api/devices", host=host)
+                for host in hosts
+            ),
+            return_exceptions=True,
         )
 
+        devices: list[dict[str, Any]] = []
+        device_hosts: dict[str, str | None] = {}
+        for host, result in zip(hosts, results):
+            if isinstance(result, BaseException):
+                if host is None or isinstance(result, asyncio.CancelledError):
+                    raise result
+                # Another data center failing should not hide the rest
+                if (result := self._host_devices.get(host)) is None:
+                    _LOGGER.warning("Could not list devices on %s", host)
+                    continue
+                _LOGGER.warning("Could not list devices on %s, using last list", host)
+            else:
+                result = self._host_devices[host] = result or []
+            for device in result:
+                device_id = str(device.get("id"))
+                if device_id not in device_hosts:
+                    device_hosts[device_id] = host
+                    devices.append(device)
+
+        self._devices = devices
+        self._device_hosts = device_hosts
+        self._devices_fetched_at = time.monotonic()
+        _LOGGER.debug(
+            "Device list refreshed: %d devices on %d hosts", len(devices), len(hosts)
+        )
+        return self._devices
+
+    def invalidate_device_cache(self) -> None:
+        """Drop the cached device list so the next call fetches it again."""
+        self._devices = None
+        self._devices_fetched_at = None
+
     async def async_get_device_info(self, device_id: str) -> dict[str, Any]:
         """Get detailed device information including properties."""
         return await self._async_request(
-            "GET", f"/iot-device/open-api/devices/info/{device_id}"
+            "GET",
+            f"/iot-device/open-api/devices/info/{device_id}",
+            host=self._device_hosts.get(device_id),
         )
 
     async def async_set_device_property(
@@ -159,5 +525,8 @@ class HinenApiClient:
         """Set device properties."""
         payload = {"deviceId": device_id, "map": properties}
         return await self._async_request(
-            "PUT", "/iot-device/open-api/devices/property_set", json=payload
+            "PUT",
+            "/iot-device/open-api/devices/property_set",
+            host=self._device_hosts.get(device_id),
+            json=payload,
         )
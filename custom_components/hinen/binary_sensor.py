@@ -11,12 +11,13 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, STATUS_ONLINE
-from .coordinator import HinenDataUpdateCoordinator
+from .coordinator import HinenDataUpdateCoordinator, HinenDeviceCoordinator
+from .entity import HinenEntity, async_add_device_entities
+from .models import PropertyAccessor, PropertySnapshot
 
 
 @dataclass
@@ -26,12 +27,11 @@ class HinenBinarySensorEntityDescription(BinarySensorEntityDescription):
     value_fn: Callable[[dict[str, Any]], bool] | None = None
 
 
-def is_battery_charging(coordinator: HinenDataUpdateCoordinator, device_id: str) -> bool:
+def is_battery_charging(battery_power: Any) -> bool:
     """Determine if battery is charging based on battery power."""
-    battery_power = coordinator.get_device_property(device_id, "BatteryPower")
-    if battery_power is None:
+    if not isinstance(battery_power, (int, float)):
         return False
-    return float(battery_power) > 0
+    return battery_power > 0
 
 
 BINARY_SENSOR_DESCRIPTIONS: tuple[HinenBinarySensorEntityDescription, ...] = (
@@ -57,68 +57,60 @@ async def async_setup_entry(
     """Set up Hinen Solar binary sensor based on a config entry."""
     coordinator: HinenDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    entities: list[HinenBinarySensor] = []
-
-    # Create binary sensors for each device
-    for device_id in coordinator.devices:
+    @callback
+    def _async_create_binary_sensors(
+        device_coordinator: HinenDeviceCoordinator,
+        snapshot: PropertySnapshot,
+        known: set[str],
+    ) -> list[HinenBinarySensor]:
+        """Create binary sensors not created yet."""
+        entities: list[HinenBinarySensor] = []
         for description in BINARY_SENSOR_DESCRIPTIONS:
-            entities.append(HinenBinarySensor(coordinator, device_id, description))
+            if description.key in known:
+                continue
+            # Battery charging state only makes sense for devices with a battery
+            if description.key == "battery_charging" and "BatteryPower" not in snapshot:
+                continue
+            known.add(description.key)
+            entities.append(HinenBinarySensor(device_coordinator, description))
+        return entities
 
-    async_add_entities(entities)
+    async_add_device_entities(
+        entry, coordinator, async_add_entities, _async_create_binary_sensors
+    )
 
 
-class HinenBinarySensor(CoordinatorEntity, BinarySensorEntity):
+class HinenBinarySensor(HinenEntity, BinarySensorEntity):
     """Representation of a Hinen Solar binary sensor."""
 
     entity_description: HinenBinarySensorEntityDescription
 
     def __init__(
         self,
-        coordinator: HinenDataUpdateCoordinator,
-        device_id: str,
+        coordinator: HinenDeviceCoordinator,
         description: HinenBinarySensorEntityDescription,
     ) -> None:
         """Initialize the binary sensor."""
-        super().__init__(coordinator)
-        self.entity_description = description
-        self._device_id = device_id
-
-        device_name = coordinator.get_device_name(device_id)
-        self._attr_name = f"{device_name} {description.name}"
-        self._attr_unique_id = f"{device_id}_{description.key}"
-
-        # Set device info with unique identifier to avoid conflicts with official integration
-        device_data = coordinator.devices.get(device_id, {})
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, f"{device_id}_advanced")},
-            "name": device_name,
-            "manufacturer": "Hinen",
-            "model": device_data.get("model_code", "Solar Inverter"),
-            "sw_version": device_data.get("firmware_version"),
-            "serial_number": device_data.get("serial_number"),
-        }
+        super().__init__(coordinator, description)
+        if description.key == "battery_charging":
+            self._property_ids = ("BatteryPower",)
+        self._battery_power = PropertyAccessor("BatteryPower")
 
     @property
     def is_on(self) -> bool:
         """Return true if the binary sensor is on."""
         if self.entity_description.key == "online":
             # Use the value_fn for online status
-            device_data = self.coordinator.devices.get(self._device_id, {})
+            device_data = self.coordinator.data or {}
             if self.entity_description.value_fn:
                 return self.entity_description.value_fn(device_data)
             return False
 
         elif self.entity_description.key == "battery_charging":
             # Check battery power to determine charging state
-            return is_battery_charging(self.coordinator, self._device_id)
+            snapshot = self.coordinator.snapshot
+            if snapshot is None:
+                return False
+            return is_battery_charging(self._battery_power(snapshot))
 
         return False
-
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        if not super().available:
-            return False
-
-        # Check if the device exists in coordinator data
-        return self._device_id in self.coordinator.devices
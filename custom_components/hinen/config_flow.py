@@ -8,15 +8,28 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.network import get_url
 
 from .api import HinenApiClient
 from .auth_callback import async_register_callback_view
-from .const import DOMAIN, OAUTH_AUTHORIZE_URL
+from .const import (
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_STALENESS,
+    DOMAIN,
+    OAUTH_AUTHORIZE_URL,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Data centers that can be listed besides the account's home host
+DATA_CENTERS = {
+    "ap": "Asia Pacific",
+    "au": "Australia",
+    "eu": "Europe",
+}
+
 # Region options
 REGIONS = {
     "AU": "Australia",
@@ -165,6 +178,7 @@ class HinenConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                                 "access_token": token_data["access_token"],
                                 "refresh_token": token_data["refresh_token"],
                                 "host": token_data["host"],
+                                "token_expiration": token_data["token_expiration"],
                             },
                         )
 
@@ -213,6 +227,34 @@ class HinenOptionsFlowHandler(config_entries.OptionsFlow):
                         "scan_interval",
                         default=self.config_entry.options.get("scan_interval", 60),
                     ): vol.All(vol.Coerce(int), vol.Range(min=30, max=300)),
+                    vol.Optional(
+                        "max_concurrent_requests",
+                        default=self.config_entry.options.get(
+                            "max_concurrent_requests", DEFAULT_MAX_CONCURRENT_REQUESTS
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=10)),
+                    vol.Optional(
+                        "adaptive_polling",
+                        default=self.config_entry.options.get("adaptive_polling", True),
+                    ): bool,
+                    vol.Optional(
+                        "phase_aligned_polling",
+                        default=self.config_entry.options.get(
+                            "phase_aligned_polling", True
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        "max_staleness",
+                        default=self.config_entry.options.get(
+                            "max_staleness", DEFAULT_MAX_STALENESS
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=60, max=3600)),
+                    vol.Optional(
+                        "additional_data_centers",
+                        default=self.config_entry.options.get(
+                            "additional_data_centers", []
+                        ),
+                    ): cv.multi_select(DATA_CENTERS),
                 }
             ),
         )
@@ -16,6 +16,114 @@ HOSTS = {
 # Default update interval
 DEFAULT_SCAN_INTERVAL = 60  # seconds
 
+# Adaptive polling: interval multipliers relative to the configured scan
+# interval while power is changing (fast) or the system is idle
+ADAPTIVE_FAST_FACTOR = 0.5
+ADAPTIVE_IDLE_FACTOR = 3
+MIN_SCAN_INTERVAL = 30  # seconds
+MAX_IDLE_SCAN_INTERVAL = 900  # seconds
+
+# Phase-aligned polling: fetch a device this long after its expected upload,
+# and never schedule polls closer together than the minimum delay
+PHASE_ALIGN_MARGIN = 20  # seconds
+PHASE_ALIGN_MIN_DELAY = 5  # seconds
+
+# Change in power between polls that counts as activity
+ADAPTIVE_POWER_THRESHOLD = 50  # W
+
+# Properties used to detect PV and battery activity
+PV_POWER_PROPERTIES = ("Pv1Power", "Pv2Power", "Pv3Power", "Pv4Power")
+BATTERY_POWER_PROPERTY = "BatteryPower"
+
+# How long the device list is cached before it is fetched again
+DEFAULT_DEVICE_LIST_TTL = 3600  # seconds
+
+# How long the last good data of a device is served after fetches fail
+DEFAULT_MAX_STALENESS = 900  # seconds
+
+# Maximum number of device info requests in flight per poll
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+
+# Access tokens are treated as expired this long before the server expiry
+TOKEN_EXPIRY_MARGIN = 300  # seconds
+
+# Background token renewal runs this long before the token is treated as expired
+TOKEN_RENEWAL_LEAD = 300  # seconds
+
+# Delay before retrying a failed background token renewal
+TOKEN_RENEWAL_RETRY = 60  # seconds
+
+# Refreshed tokens written within this window are saved to the entry once
+TOKEN_SAVE_COOLDOWN = 10  # seconds
+
+# Request resilience
+REQUEST_TIMEOUT = 20  # seconds per attempt
+REQUEST_MAX_RETRIES = 3
+RETRY_BACKOFF_BASE = 1  # seconds, doubled per attempt
+RETRY_BACKOFF_MAX = 10  # seconds
+CIRCUIT_FAILURE_THRESHOLD = 5  # consecutive transient failures
+CIRCUIT_RESET_TIMEOUT = 60  # seconds before probing an open circuit
+CIRCUIT_MAX_RESET_TIMEOUT = 900  # seconds
+
+# Result codes that mean "try again later" (rate limited or busy). Codes
+# starting with B (system error) or C (third-party service error) are
+# retried as well.
+RETRYABLE_API_CODES = frozenset({"A0500", "A0501", "A0502", "A0503"})
+
+# Client-side rate limit shared by all entries using the same host and
+# client ID (the open platform allows 2500 requests per 5 minutes)
+RATE_LIMIT_PER_SECOND = 5
+RATE_LIMIT_BURST = 10
+
+# Entries spread their first poll over this window so they do not align
+POLL_STAGGER_WINDOW = 15  # seconds
+
+# Histogram bucket bounds for API request latency and for local
+# processing (parsing, entity fan-out)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20)  # seconds
+PROCESSING_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)  # seconds
+
+# Raw device info responses kept per device for the diagnostics download
+DIAGNOSTICS_HISTORY_SIZE = 5
+
+# Lifetime energy counters imported as hourly long-term statistics
+ENERGY_COUNTER_PROPERTIES = (
+    "CumulativeConsumption",
+    "CumulativeGridFeedIn",
+    "CumulativeEnergyPurchased",
+    "TotalChargingEnergy",
+    "TotalDischargingEnergy",
+)
+STATISTICS_STORAGE_VERSION = 1
+STATISTICS_IMPORT_INTERVAL = 3600  # seconds
+STATISTICS_IMPORT_CHUNK = 500  # hourly rows per recorder job
+STATISTICS_SAVE_DELAY = 60  # seconds
+
+# Local energy integration: channel -> (power properties, sign, cloud
+# counter it is reconciled against). Power is counted while sign * power
+# is positive; grid power is positive while feeding in, battery power
+# while charging.
+ENERGY_CHANNELS = {
+    "pv_generation": (PV_POWER_PROPERTIES, 1, None),
+    "consumption": (("TotalLoadPower",), 1, "CumulativeConsumption"),
+    "grid_feed_in": (("GridTotalPower",), 1, "CumulativeGridFeedIn"),
+    "energy_purchased": (("GridTotalPower",), -1, "CumulativeEnergyPurchased"),
+    "charging": ((BATTERY_POWER_PROPERTY,), 1, "TotalChargingEnergy"),
+    "discharging": ((BATTERY_POWER_PROPERTY,), -1, "TotalDischargingEnergy"),
+}
+# Samples further apart than this are not integrated, the cloud counters
+# cover the gap
+ENERGY_MAX_SAMPLE_GAP = 900  # seconds
+ENERGY_STORAGE_VERSION = 1
+ENERGY_SAVE_DELAY = 60  # seconds
+
+# Property writes to a device made within this window are sent together
+WRITE_COALESCE_WINDOW = 0.5  # seconds
+# Written values are read back after this delay, a few times at most, to
+# give the device time to apply them
+WRITE_VERIFY_DELAY = 2  # seconds
+WRITE_VERIFY_ATTEMPTS = 3
+
 # Grant types
 GRANT_TYPE_AUTHORIZATION_CODE = 1
 GRANT_TYPE_REFRESH_TOKEN = 2
@@ -1,110 +1,685 @@
 """DataUpdateCoordinator for Hinen Solar."""
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
-from datetime import timedelta
+import time
+from collections import deque
+from datetime import datetime, timedelta
 from typing import Any
 
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .api import HinenApiClient
-from .const import DEFAULT_SCAN_INTERVAL, DOMAIN
+from .energy import EnergyIntegrator
+from .metrics import Histogram
+from .models import ModelLayout, PropertySnapshot, UploadTracker, newest_timestamp
+from .writer import PropertyWriter
+from .const import (
+    ADAPTIVE_FAST_FACTOR,
+    ADAPTIVE_IDLE_FACTOR,
+    ADAPTIVE_POWER_THRESHOLD,
+    BATTERY_POWER_PROPERTY,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_STALENESS,
+    DEFAULT_SCAN_INTERVAL,
+    DIAGNOSTICS_HISTORY_SIZE,
+    DOMAIN,
+    ENERGY_SAVE_DELAY,
+    ENERGY_STORAGE_VERSION,
+    LATENCY_BUCKETS,
+    MAX_IDLE_SCAN_INTERVAL,
+    MIN_SCAN_INTERVAL,
+    PHASE_ALIGN_MARGIN,
+    PHASE_ALIGN_MIN_DELAY,
+    POLL_STAGGER_WINDOW,
+    PROCESSING_BUCKETS,
+    PV_POWER_PROPERTIES,
+    STATUS_HIBERNATE,
+    STATUS_OFFLINE,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 
 class HinenDataUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching Hinen Solar data."""
+    """Class to manage the Hinen Solar device inventory.
 
-    def __init__(self, hass: HomeAssistant, api: HinenApiClient) -> None:
+    The device list is refreshed on its own slow schedule. Every device
+    gets a HinenDeviceCoordinator that polls it with its own cadence,
+    error state and listeners.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, api: HinenApiClient, entry: ConfigEntry
+    ) -> None:
         """Initialize the coordinator."""
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+            update_interval=timedelta(seconds=api.device_list_ttl),
         )
         self.api = api
-        self.devices: dict[str, dict[str, Any]] = {}
+        self.entry = entry
+        # Options last applied, to tell option changes from credential saves
+        self.applied_options = dict(entry.options)
+        self.device_coordinators: dict[str, HinenDeviceCoordinator] = {}
+        # Bounds the device info requests in flight across all devices
+        self._semaphore_size = max(1, self.max_concurrent_requests)
+        self.semaphore = asyncio.Semaphore(self._semaphore_size)
+        # Property layouts and static metadata, one per device model
+        self.layouts: dict[str | None, ModelLayout] = {}
+        # Fixed per-entry offset so entries on the same host poll at different times
+        digest = hashlib.sha1(entry.entry_id.encode()).digest()
+        self.stagger_offset = int.from_bytes(digest[:4], "big") % (
+            POLL_STAGGER_WINDOW * 1000
+        ) / 1000
+        # Locally integrated energy of every device, kept across restarts
+        self._energy_store: Store[dict[str, Any]] = Store(
+            hass, ENERGY_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.energy"
+        )
+        self.stored_energy: dict[str, Any] = {}
 
-    async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch data from API."""
+    @property
+    def max_concurrent_requests(self) -> int:
+        """Return the maximum number of device requests in flight."""
+        return self.entry.options.get(
+            "max_concurrent_requests", DEFAULT_MAX_CONCURRENT_REQUESTS
+        )
+
+    @property
+    def max_staleness(self) -> timedelta:
+        """Return how long last good device data may be served."""
+        return timedelta(
+            seconds=self.entry.options.get("max_staleness", DEFAULT_MAX_STALENESS)
+        )
+
+    @property
+    def scan_interval(self) -> int:
+        """Return the configured scan interval in seconds."""
+        return self.entry.options.get("scan_interval", DEFAULT_SCAN_INTERVAL)
+
+    @property
+    def adaptive_polling(self) -> bool:
+        """Return whether the poll interval follows device activity."""
+        return self.entry.options.get("adaptive_polling", True)
+
+    @property
+    def phase_aligned_polling(self) -> bool:
+        """Return whether devices are fetched just after their expected upload."""
+        return self.entry.options.get("phase_aligned_polling", True)
+
+    def interval_for_mode(self, mode: str) -> timedelta:
+        """Return the poll interval for a polling mode."""
+        interval = self.scan_interval
+        if mode == "fast":
+            interval = max(MIN_SCAN_INTERVAL, interval * ADAPTIVE_FAST_FACTOR)
+        elif mode == "idle":
+            interval = min(MAX_IDLE_SCAN_INTERVAL, interval * ADAPTIVE_IDLE_FACTOR)
+        return timedelta(seconds=interval)
+
+    def get_layout(self, model_code: str | None) -> ModelLayout:
+        """Return the shared property layout of a device model."""
+        if (layout := self.layouts.get(model_code)) is None:
+            layout = self.layouts[model_code] = ModelLayout(model_code)
+        return layout
+
+    async def async_apply_options(self) -> None:
+        """Apply changed options without reloading the entry."""
+        if (size := max(1, self.max_concurrent_requests)) != self._semaphore_size:
+            # Requests in flight keep the old semaphore until they finish
+            self._semaphore_size = size
+            self.semaphore = asyncio.Semaphore(size)
+        await asyncio.gather(
+            *(
+                coordinator.async_apply_options()
+                for coordinator in self.device_coordinators.values()
+                if not coordinator.removed
+            )
+        )
+
+    async def async_load_energy(self) -> None:
+        """Load the stored energy integrators; call before the first refresh."""
+        self.stored_energy = await self._energy_store.async_load() or {}
+
+    @callback
+    def async_save_energy(self) -> None:
+        """Schedule a save of the energy integrators."""
+        self._energy_store.async_delay_save(self._energy_data_to_save, ENERGY_SAVE_DELAY)
+
+    @callback
+    def _energy_data_to_save(self) -> dict[str, Any]:
+        """Return the energy integrators to store."""
+        # Devices not listed right now keep their stored state
+        return {
+            **self.stored_energy,
+            **{
+                device_id: coordinator.energy.as_dict()
+                for device_id, coordinator in self.device_coordinators.items()
+            },
+        }
+
+    async def async_refresh_device_list(self) -> None:
+        """Invalidate the device inventory and refresh immediately."""
+        self.api.invalidate_device_cache()
+        await self.async_request_refresh()
+
+    async def _async_update_data(self) -> list[dict[str, Any]]:
+        """Fetch the device list and add or remove device coordinators."""
         try:
-            # Get list of devices
-            devices = await self.api.async_get_devices()
+            # The first refresh reuses the list fetched while verifying auth
+            devices = await self.api.async_get_devices(
+                force_refresh=self.data is not None
+            )
+        except Exception as err:
+            raise UpdateFailed(f"Error communicating with API: {err}") from err
+
+        device_ids = [str(device["id"]) for device in devices]
 
-            device_data = {}
-            for device in devices:
-                device_id = str(device["id"])
+        for device_id in self.device_coordinators.keys() - set(device_ids):
+            coordinator = self.device_coordinators[device_id]
+            if not coordinator.removed:
+                _LOGGER.info("Device %s is no longer listed, pausing updates", device_id)
+                coordinator.removed = True
+                coordinator.update_interval = None
+                coordinator.async_update_listeners()
 
+        # Coordinators are kept for unlisted devices so their entities come
+        # back if the device is listed again
+        refresh: list[HinenDeviceCoordinator] = []
+        for device_id in device_ids:
+            if (coordinator := self.device_coordinators.get(device_id)) is None:
+                coordinator = HinenDeviceCoordinator(self.hass, self, device_id)
+            elif coordinator.removed:
+                coordinator.removed = False
+                coordinator.update_interval = self.interval_for_mode(
+                    coordinator.polling_mode
+                )
+            else:
+                continue
+            refresh.append(coordinator)
+
+        if refresh:
+            # Fetch new devices before publishing them so platforms can
+            # create their entities straight away
+            start = time.monotonic()
+            await asyncio.gather(*(coordinator.async_refresh() for coordinator in refresh))
+            _LOGGER.debug(
+                "Fetched %d new devices in %.3fs (sequential estimate %.3fs)",
+                len(refresh),
+                time.monotonic() - start,
+                sum(coordinator.latency or 0 for coordinator in refresh),
+            )
+            for coordinator in refresh:
+                self.device_coordinators[coordinator.device_id] = coordinator
+
+        return devices
+
+    async def async_shutdown(self) -> None:
+        """Stop the inventory refresh and every device coordinator."""
+        await super().async_shutdown()
+        for coordinator in self.device_coordinators.values():
+            await coordinator.async_shutdown()
+        if self.device_coordinators:
+            await self._energy_store.async_save(self._energy_data_to_save())
+
+
+class HinenDeviceCoordinator(DataUpdateCoordinator):
+    """Class to manage fetching data for a single Hinen Solar device."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        fleet: HinenDataUpdateCoordinator,
+        device_id: str,
+    ) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN} device {device_id}",
+            update_interval=fleet.interval_for_mode("normal"),
+        )
+        self.fleet = fleet
+        self.device_id = device_id
+        # Set once the device disappears from the device list
+        self.removed = False
+        # Polling mode chosen by the adaptive scheduler: fast, normal or idle
+        self.polling_mode = "normal"
+        # Latency of the last device info request, in seconds
+        self.latency: float | None = None
+        # Request latency, parse time and listener fan-out time histograms
+        self.latency_histogram = Histogram(LATENCY_BUCKETS)
+        self.parse_histogram = Histogram(PROCESSING_BUCKETS)
+        self.fanout_histogram = Histogram(PROCESSING_BUCKETS)
+        # Listeners of the timing sensors, called after the timed fan-out
+        self._metrics_listeners: list[CALLBACK_TYPE] = []
+        # Last raw responses with their latency and parse result, for the
+        # diagnostics download; bounded so it can always stay on
+        self.history: deque[dict[str, Any]] = deque(maxlen=DIAGNOSTICS_HISTORY_SIZE)
+        # Time of the last successful fetch; when fetches fail the last good
+        # data is served until it is too old
+        self.last_success: datetime | None = None
+        self._unsub_stale: CALLBACK_TYPE | None = None
+        # Newest property timestamp and learned upload cadence
+        self.upload_tracker = UploadTracker()
+        # Properties whose value changed in the last update
+        self.changed_properties: set[str] = set()
+        # Energy channels whose integrated value changed in the last update
+        self.changed_energy: set[str] = set()
+        # Device-level fields changed (or first data) in the last update
+        self.device_changed = True
+        # Set when every entity must be written, e.g. after a failed update
+        self._full_update = True
+        self._stagger_pending = True
+        self.writer = PropertyWriter(hass, self)
+        # Energy integrated locally from the power properties
+        self.energy = EnergyIntegrator(fleet.stored_energy.get(device_id))
+
+    @property
+    def snapshot(self) -> PropertySnapshot | None:
+        """Return the property snapshot of the device."""
+        if self.data is None:
+            return None
+        return self.data["properties"]
+
+    @property
+    def device_name(self) -> str:
+        """Return the name of the device."""
+        if self.data:
+            return self.data.get("name", f"Device {self.device_id}")
+        return f"Device {self.device_id}"
+
+    @property
+    def is_available(self) -> bool:
+        """Return True if the device has data that is not too old."""
+        return (
+            not self.removed
+            and self.data is not None
+            and self.last_success is not None
+            and dt_util.utcnow() - self.last_success <= self.fleet.max_staleness
+        )
+
+    @callback
+    def _schedule_stale_check(self) -> None:
+        """Update the listeners once the last good data goes stale.
+
+        Only the first failed poll of an outage notifies listeners, so
+        without this entities would stay available on stale data.
+        """
+        if self._unsub_stale is not None:
+            self._unsub_stale()
+            self._unsub_stale = None
+        if self.last_success is None or self.removed:
+            return
+        delay = self.last_success + self.fleet.max_staleness - dt_util.utcnow()
+        self._unsub_stale = async_call_later(
+            self.hass, max(delay.total_seconds(), 0), self._async_stale_check
+        )
+
+    @callback
+    def _async_stale_check(self, _now: datetime) -> None:
+        """Write every entity if the device data has gone stale."""
+        self._unsub_stale = None
+        if self.is_available:
+            # Woken at the limit itself, check again once it has passed
+            self._schedule_stale_check()
+            return
+        _LOGGER.debug(
+            "Data of device %s is stale, marking it unavailable", self.device_id
+        )
+        self._full_update = True
+        self.async_update_listeners()
+
+    async def async_shutdown(self) -> None:
+        """Stop polling and the staleness check."""
+        await super().async_shutdown()
+        if self._unsub_stale is not None:
+            self._unsub_stale()
+            self._unsub_stale = None
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners, timing the fan-out."""
+        start = time.perf_counter()
+        super().async_update_listeners()
+        self.fanout_histogram.observe(time.perf_counter() - start)
+        for update_callback in list(self._metrics_listeners):
+            update_callback()
+
+    @callback
+    def async_add_metrics_listener(
+        self, update_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Listen for updates after the fan-out, so it is not part of the timing."""
+        self._metrics_listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the metrics listener."""
+            self._metrics_listeners.remove(update_callback)
+
+        return remove_listener
+
+    @property
+    def metrics(self) -> dict[str, Any]:
+        """Return the timing histograms of this device."""
+        return {
+            "request_latency": self.latency_histogram.as_dict(),
+            "parse_time": self.parse_histogram.as_dict(),
+            "fanout_time": self.fanout_histogram.as_dict(),
+        }
+
+    def has_changed(self, property_ids: tuple[str, ...]) -> bool:
+        """Return True if an entity reading these properties needs a state write."""
+        if self._full_update or not self.last_update_success or self.removed:
+            return True
+        if self.device_changed:
+            return True
+        return not self.changed_properties.isdisjoint(property_ids)
+
+    def reports_value(self, property_id: str, value: Any) -> bool:
+        """Return True if the device already reports a raw API value."""
+        snapshot = self.snapshot
+        if snapshot is None or property_id not in snapshot:
+            return False
+        index = snapshot.layout.index[property_id]
+        decoded = snapshot.layout.metadata[index].decode(value)
+        return snapshot.value_at(index) == decoded
+
+    async def async_set_properties(self, properties: dict[str, Any]) -> None:
+        """Write raw property values to the device.
+
+        Writes from concurrent callers are coalesced into one request and
+        return once the device reports the new values.
+        """
+        await self.writer.async_write(properties)
+
+    async def async_read_back(self, expected: dict[str, Any]) -> set[str]:
+        """Read back written properties; return those not reported yet.
+
+        Only the written properties are merged into the current snapshot
+        and only their entities are updated; the poll schedule is kept.
+        """
+        device_info = await self.fleet.api.async_get_device_info(self.device_id)
+        if self.data is None:
+            return set(expected)
+
+        layout = self.fleet.get_layout(device_info.get("modelCode"))
+        if layout is not self.data["properties"].layout:
+            # Model changed under us, leave it to the next regular poll
+            return set(expected)
+
+        snapshot = self.data["properties"].copy()
+        for prop in device_info.get("properties", []):
+            if prop.get("identifier") in expected:
+                index = layout.slot(prop)
+                snapshot.set(
+                    index,
+                    layout.metadata[index].decode(prop.get("value")),
+                    prop.get("timestamp"),
+                )
+
+        previous = self.data["properties"]
+        self.data = {**self.data, "properties": snapshot}
+        self.changed_properties = snapshot.changed(previous)
+        self.changed_energy = set()
+        self.device_changed = False
+        self._full_update = False
+        if self.changed_properties:
+            self.async_update_listeners()
+
+        return {
+            property_id
+            for property_id, value in expected.items()
+            if not self.reports_value(property_id, value)
+        }
+
+    async def async_apply_options(self) -> None:
+        """Apply changed options to the polling schedule."""
+        # The staleness limit may have changed
+        self._schedule_stale_check()
+        previous = self.update_interval
+        if not self.fleet.adaptive_polling:
+            self.polling_mode = "normal"
+        # Keep the current mode, only the interval it maps to may have changed
+        self.update_interval = self.fleet.interval_for_mode(self.polling_mode)
+        if self.update_interval != previous:
+            _LOGGER.debug(
+                "Update interval of device %s changed to %s",
+                self.device_id,
+                self.update_interval,
+            )
+            # Refreshing reschedules the next poll with the new interval
+            await self.async_request_refresh()
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Fetch data from API."""
+        previous = self.data
+        if self.removed:
+            # A poll scheduled before the device was unlisted
+            return previous
+        self._full_update = not self.last_update_success
+
+        try:
+            async with self.fleet.semaphore:
+                start = time.monotonic()
                 try:
                     # Get detailed device information with properties
-                    device_info = await self.api.async_get_device_info(device_id)
-
-                    # Store device data with properties
-                    device_data[device_id] = {
-                        "id": device_id,
-                        "name": device_info.get("deviceName", f"Device {device_id}"),
-                        "serial_number": device_info.get("serialNumber"),
-                        "model_code": device_info.get("modelCode"),
-                        "product_name": device_info.get("productName"),
-                        "firmware_version": device_info.get("firmwareVersion"),
-                        "status": device_info.get("status"),
-                        "alert_status": device_info.get("alertStatus"),
-                        "properties": self._parse_properties(
-                            device_info.get("properties", [])
-                        ),
-                    }
-
-                except Exception as err:
-                    _LOGGER.error(
-                        "Error fetching data for device %s: %s", device_id, err
+                    device_info = await self.fleet.api.async_get_device_info(
+                        self.device_id
                     )
-                    continue
+                finally:
+                    self.latency = time.monotonic() - start
+                    self.latency_histogram.observe(self.latency)
+        except Exception as err:
+            self.history.append(
+                {"time": dt_util.utcnow(), "latency": self.latency, "error": str(err)}
+            )
+            # Retry on the regular schedule, not a long phase-aligned delay
+            self.update_interval = self.fleet.interval_for_mode(self.polling_mode)
+            raise UpdateFailed(
+                f"Error fetching data for device {self.device_id}: {err}"
+            ) from err
 
-            self.devices = device_data
-            return device_data
+        _LOGGER.debug("Fetched device %s in %.3fs", self.device_id, self.latency)
 
-        except Exception as err:
-            raise UpdateFailed(f"Error communicating with API: {err}") from err
+        device = self._build_device(device_info, previous)
+        self.last_success = dt_util.utcnow()
+        self._schedule_stale_check()
+        self.changed_energy = set()
+        if previous is None or device["properties"] is not previous["properties"]:
+            self.changed_energy = self.energy.update(
+                device["properties"], self.last_success.timestamp()
+            )
+            if self.changed_energy:
+                self.fleet.async_save_energy()
+        self._diff(previous, device)
+        self._schedule_next_poll(previous, device)
+        self.history.append(
+            {
+                "time": self.last_success,
+                "latency": self.latency,
+                "response": device_info,
+                "snapshot": device["properties"],
+                "reused": previous is not None
+                and device["properties"] is previous["properties"],
+                "changed": None if self.device_changed else self.changed_properties,
+            }
+        )
+        return device
 
-    def _parse_properties(
-        self, properties: list[dict[str, Any]]
+    def _build_device(
+        self, device_info: dict[str, Any], previous: dict[str, Any] | None
     ) -> dict[str, Any]:
-        """Parse properties array into a dictionary."""
-        parsed = {}
+        """Build device data from a device info response."""
+        # The device shadow is never used, do not keep it in the history
+        device_info.pop("shadow", None)
+        properties = device_info.get("properties", [])
+        model_code = device_info.get("modelCode")
+        if (
+            not self.upload_tracker.update(newest_timestamp(properties))
+            and previous is not None
+            and previous["properties"].layout.model_code == model_code
+        ):
+            # No property timestamp advanced, reuse the parsed snapshot
+            snapshot = previous["properties"]
+        else:
+            start = time.perf_counter()
+            snapshot = self._parse_properties(model_code, properties)
+            self.parse_histogram.observe(time.perf_counter() - start)
+
+        # Store device data with properties
+        return {
+            "id": self.device_id,
+            "name": device_info.get("deviceName", f"Device {self.device_id}"),
+            "serial_number": device_info.get("serialNumber"),
+            "model_code": model_code,
+            "product_name": device_info.get("productName"),
+            "firmware_version": device_info.get("firmwareVersion"),
+            "status": device_info.get("status"),
+            "alert_status": device_info.get("alertStatus"),
+            "properties": snapshot,
+        }
+
+    def _parse_properties(
+        self, model_code: str | None, properties: list[dict[str, Any]]
+    ) -> PropertySnapshot:
+        """Parse properties array into a compact snapshot.
+
+        Name, datatype and specs are only read the first time a property
+        is seen; after that specs are dropped from the raw response so the
+        diagnostics history does not keep them alive.
+        """
+        layout = self.fleet.get_layout(model_code)
+        metadata = layout.metadata
+        index_get = layout.index.get
+        snapshot = PropertySnapshot(layout)
         for prop in properties:
-            identifier = prop.get("identifier")
-            if identifier:
-                parsed[identifier] = {
-                    "name": prop.get("name"),
-                    "value": prop.get("value"),
-                    "shadow": prop.get("shadow"),
-                    "timestamp": prop.get("timestamp"),
-                    "datatype": prop.get("datatype"),
-                    "specs": prop.get("specs"),
-                }
-        return parsed
-
-    def get_device_property(
-        self, device_id: str, property_id: str
-    ) -> Any | None:
-        """Get a specific property value for a device."""
-        device = self.devices.get(device_id)
-        if not device:
+            if not (identifier := prop.get("identifier")):
+                continue
+            index = index_get(identifier)
+            if index is None or not metadata[index].reported:
+                index = layout.slot(prop)
+            else:
+                prop.pop("specs", None)
+            snapshot.set(
+                index,
+                metadata[index].decode(prop.get("value")),
+                prop.get("timestamp"),
+            )
+        return snapshot
+
+    def _diff(self, previous: dict[str, Any] | None, current: dict[str, Any]) -> None:
+        """Record which properties changed since the last update."""
+        self.changed_properties = set()
+        self.device_changed = previous is None or any(
+            previous.get(key) != value
+            for key, value in current.items()
+            if key != "properties"
+        )
+        if self.device_changed or current["properties"] is previous["properties"]:
+            # Everything is written anyway, or the snapshot was reused
+            return
+        self.changed_properties = current["properties"].changed(previous["properties"])
+
+    def _schedule_next_poll(
+        self, previous: dict[str, Any] | None, current: dict[str, Any]
+    ) -> None:
+        """Pick the next poll interval from activity and upload phase."""
+        mode = self._polling_mode(previous, current)
+        if mode != self.polling_mode:
+            _LOGGER.debug(
+                "Polling mode of device %s changed from %s to %s",
+                self.device_id,
+                self.polling_mode,
+                mode,
+            )
+        self.polling_mode = mode
+        interval = self.fleet.interval_for_mode(mode)
+
+        if (fetch_at := self._next_fetch_time()) is not None:
+            delay = (fetch_at - dt_util.utcnow()).total_seconds()
+            # A passed upload time is retried on the regular schedule rather
+            # than in a tight loop
+            if delay > 0:
+                interval = timedelta(
+                    seconds=min(max(delay, PHASE_ALIGN_MIN_DELAY), MAX_IDLE_SCAN_INTERVAL)
+                )
+
+        if self._stagger_pending:
+            # Shift this entry's schedule once; later polls keep the phase
+            self._stagger_pending = False
+            interval += timedelta(seconds=self.fleet.stagger_offset)
+
+        self.update_interval = interval
+
+    def _next_fetch_time(self) -> datetime | None:
+        """Return when the device should next be fetched.
+
+        None means the device follows the regular schedule: its upload
+        cadence is not known yet or it missed its expected upload.
+        """
+        tracker = self.upload_tracker
+        if (
+            not self.fleet.phase_aligned_polling
+            or tracker.cadence is None
+            or (expected := tracker.expected_next) is None
+            or self.last_success is None
+        ):
             return None
 
-        properties = device.get("properties", {})
-        prop = properties.get(property_id)
-        if not prop:
+        fetch_at = dt_util.utc_from_timestamp(expected) + timedelta(
+            seconds=PHASE_ALIGN_MARGIN
+        )
+        if dt_util.utcnow() > fetch_at + timedelta(seconds=tracker.cadence):
+            # Overdue by a whole period, poll until the device catches up
             return None
+        # Never let the data get near the staleness limit
+        return min(fetch_at, self.last_success + self.fleet.max_staleness / 2)
+
+    def _polling_mode(
+        self, previous: dict[str, Any] | None, current: dict[str, Any]
+    ) -> str:
+        """Pick the polling mode from device state and activity."""
+        if not self.fleet.adaptive_polling:
+            return "normal"
+        if current.get("status") in (STATUS_OFFLINE, STATUS_HIBERNATE):
+            return "idle"
+        if self._power_changed(previous, current):
+            return "fast"
+        if not self._pv_power(current):
+            # No PV generation, i.e. night time
+            return "idle"
+        return "normal"
+
+    def _power_changed(
+        self, previous: dict[str, Any] | None, current: dict[str, Any]
+    ) -> bool:
+        """Return True if PV or battery power moved since the last poll."""
+        if previous is None:
+            return False
+        if abs(self._pv_power(current) - self._pv_power(previous)) >= ADAPTIVE_POWER_THRESHOLD:
+            return True
+        old = self._power_value(previous, BATTERY_POWER_PROPERTY)
+        new = self._power_value(current, BATTERY_POWER_PROPERTY)
+        return abs(new - old) >= ADAPTIVE_POWER_THRESHOLD
 
-        return prop.get("value")
+    def _pv_power(self, device: dict[str, Any]) -> float:
+        """Return the total PV power of a device."""
+        return sum(self._power_value(device, key) for key in PV_POWER_PROPERTIES)
 
-    def get_device_name(self, device_id: str) -> str:
-        """Get the name of a device."""
-        device = self.devices.get(device_id)
-        if device:
-            return device.get("name", f"Device {device_id}")
-        return f"Device {device_id}"
+    @staticmethod
+    def _power_value(device: dict[str, Any], property_id: str) -> float:
+        """Return a power property as a float, treating missing values as 0."""
+        value = device["properties"].get(property_id)
+        if value is None:
+            return 0.0
+        return value if isinstance(value, (int, float)) else 0.0
@@ -0,0 +1,118 @@
+"""Diagnostics support for Hinen Solar."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import REDACTED, async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import HinenDataUpdateCoordinator, HinenDeviceCoordinator
+from .models import PropertySnapshot
+
+TO_REDACT = {
+    "client_secret",
+    "clientSecret",
+    "access_token",
+    "accessToken",
+    "refresh_token",
+    "refreshToken",
+    "serial_number",
+    "serialNumber",
+}
+
+
+def _is_serial(identifier: Any) -> bool:
+    """Return True if a property identifier names a serial number."""
+    return isinstance(identifier, str) and (
+        "serial" in identifier.lower() or identifier.lower() == "sn"
+    )
+
+
+def _redact_response(response: dict[str, Any]) -> dict[str, Any]:
+    """Return a raw response with serial number properties redacted."""
+    return {
+        **response,
+        "properties": [
+            {**prop, "value": REDACTED} if _is_serial(prop.get("identifier")) else prop
+            for prop in response.get("properties") or []
+        ],
+    }
+
+
+def _snapshot_values(snapshot: PropertySnapshot) -> dict[str, Any]:
+    """Return the decoded values of a snapshot with their timestamps."""
+    return {
+        metadata.identifier: {
+            "value": (
+                REDACTED
+                if _is_serial(metadata.identifier)
+                else snapshot.get(metadata.identifier)
+            ),
+            "timestamp": snapshot.timestamp(metadata.identifier),
+        }
+        for metadata in snapshot.reported()
+    }
+
+
+def _history(device_coordinator: HinenDeviceCoordinator) -> list[dict[str, Any]]:
+    """Return the recent fetches of a device, newest first."""
+    history = []
+    for fetch in reversed(device_coordinator.history):
+        item: dict[str, Any] = {
+            "time": fetch["time"].isoformat(),
+            "latency_ms": (
+                None if fetch["latency"] is None else round(fetch["latency"] * 1000, 2)
+            ),
+        }
+        if "error" in fetch:
+            item["error"] = fetch["error"]
+        else:
+            changed = fetch["changed"]
+            item["response"] = _redact_response(fetch["response"])
+            item["parsed"] = {
+                "reused_snapshot": fetch["reused"],
+                "changed": "all" if changed is None else sorted(changed),
+                "properties": _snapshot_values(fetch["snapshot"]),
+            }
+        history.append(item)
+    return history
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    Built from what the integration already holds, no API call is made.
+    """
+    coordinator: HinenDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    api = coordinator.api
+
+    diagnostics = {
+        "entry": {"data": dict(entry.data), "options": dict(entry.options)},
+        "api": {
+            "hosts": api.hosts,
+            "endpoints": api.metrics.as_dict(),
+            "resilience": api.resilience_stats,
+            "rate_limit": api.rate_limit_stats,
+        },
+        "devices": {
+            device_id: {
+                "available": device_coordinator.is_available,
+                "last_update_success": device_coordinator.last_update_success,
+                "polling_mode": device_coordinator.polling_mode,
+                "update_interval": (
+                    device_coordinator.update_interval.total_seconds()
+                    if device_coordinator.update_interval
+                    else None
+                ),
+                "write_batches": device_coordinator.writer.stats,
+                **device_coordinator.metrics,
+                "history": _history(device_coordinator),
+            }
+            for device_id, device_coordinator in coordinator.device_coordinators.items()
+        },
+    }
+    return async_redact_data(diagnostics, TO_REDACT)
@@ -0,0 +1,147 @@
+"""Local energy integration from Hinen Solar power samples."""
+from __future__ import annotations
+
+from typing import Any
+
+from .const import ENERGY_CHANNELS, ENERGY_MAX_SAMPLE_GAP
+from .models import PropertySnapshot, timestamp_to_seconds
+
+
+class EnergyChannel:
+    """Energy accumulated from one power flow, in kWh.
+
+    Power samples are integrated with the trapezoidal rule. When the
+    channel has a cloud counter, the value follows that counter plus the
+    energy integrated since the counter last moved: integration adds
+    resolution between counter steps and the counter corrects any drift.
+    The value never decreases.
+    """
+
+    __slots__ = ("value", "since", "cloud", "offset", "last_time", "last_power")
+
+    def __init__(self) -> None:
+        """Initialize an empty channel."""
+        self.value = 0.0
+        # Energy integrated since the cloud counter last changed
+        self.since = 0.0
+        # Last cloud counter value and the sum of counter values before resets
+        self.cloud: float | None = None
+        self.offset = 0.0
+        self.last_time: float | None = None
+        self.last_power = 0.0
+
+    def add_sample(self, time: float, power: float) -> bool:
+        """Integrate a power sample in W; return True if the value changed."""
+        last_time, last_power = self.last_time, self.last_power
+        if last_time is not None and time <= last_time:
+            return False
+        self.last_time = time
+        self.last_power = power
+        if last_time is None or time - last_time > ENERGY_MAX_SAMPLE_GAP:
+            return False
+
+        energy = (last_power + power) / 2 * (time - last_time) / 3_600_000
+        if energy <= 0:
+            return False
+        self.since += energy
+        return self._set(self.value + energy if self.cloud is None else None)
+
+    def reconcile(self, counter: float) -> bool:
+        """Align with the cloud counter; return True if the value changed."""
+        if self.cloud is not None:
+            if counter == self.cloud:
+                return False
+            if counter < self.cloud:
+                # Counter reset on the device
+                self.offset += self.cloud
+        self.cloud = counter
+        self.since = 0.0
+        return self._set(None)
+
+    def _set(self, value: float | None) -> bool:
+        """Raise the value to value, or to the reconciled value if None."""
+        if value is None:
+            value = self.offset + (self.cloud or 0.0) + self.since
+        if value <= self.value:
+            return False
+        self.value = value
+        return True
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the channel state for storage."""
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> EnergyChannel:
+        """Restore a channel from storage."""
+        channel = cls()
+        for slot in cls.__slots__:
+            if slot in data:
+                setattr(channel, slot, data[slot])
+        return channel
+
+
+class EnergyIntegrator:
+    """Energy channels of one device, fed from its property snapshots."""
+
+    __slots__ = ("channels",)
+
+    def __init__(self, data: dict[str, Any] | None = None) -> None:
+        """Initialize the integrator, restoring stored channels."""
+        self.channels: dict[str, EnergyChannel] = {
+            name: EnergyChannel.from_dict(channel)
+            for name, channel in (data or {}).items()
+            if name in ENERGY_CHANNELS
+        }
+
+    @staticmethod
+    def supported(snapshot: PropertySnapshot) -> list[str]:
+        """Return the channels a snapshot has power readings for."""
+        return [
+            name
+            for name, (power_ids, _, _) in ENERGY_CHANNELS.items()
+            if any(power_id in snapshot for power_id in power_ids)
+        ]
+
+    def update(self, snapshot: PropertySnapshot, now: float) -> set[str]:
+        """Integrate a new snapshot; return the channels whose value changed."""
+        changed = set()
+        for name in self.supported(snapshot):
+            power_ids, sign, counter_id = ENERGY_CHANNELS[name]
+            channel = self.channels.get(name)
+            if channel is None:
+                channel = self.channels[name] = EnergyChannel()
+
+            power = 0.0
+            sample_time = None
+            for power_id in power_ids:
+                value = snapshot.get(power_id)
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    power += value
+                seconds = timestamp_to_seconds(snapshot.timestamp(power_id))
+                if seconds is not None and (sample_time is None or seconds > sample_time):
+                    sample_time = seconds
+            if channel.add_sample(
+                sample_time if sample_time is not None else now, max(0.0, sign * power)
+            ):
+                changed.add(name)
+
+            if counter_id is not None:
+                counter = snapshot.get(counter_id)
+                if (
+                    isinstance(counter, (int, float))
+                    and not isinstance(counter, bool)
+                    and channel.reconcile(float(counter))
+                ):
+                    changed.add(name)
+        return changed
+
+    def value(self, name: str) -> float | None:
+        """Return the energy of a channel in kWh."""
+        if (channel := self.channels.get(name)) is None:
+            return None
+        return channel.value
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the integrator state for storage."""
+        return {name: channel.as_dict() for name, channel in self.channels.items()}
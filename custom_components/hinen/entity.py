@@ -0,0 +1,180 @@
+"""Base entity for Hinen Solar."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity import Entity, EntityDescription
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import HinenDataUpdateCoordinator, HinenDeviceCoordinator
+from .models import ModelLayout, PropertyAccessor, PropertySnapshot
+
+
+@callback
+def async_add_device_entities(
+    entry: ConfigEntry,
+    coordinator: HinenDataUpdateCoordinator,
+    async_add_entities: AddEntitiesCallback,
+    create_entities: Callable[
+        [HinenDeviceCoordinator, PropertySnapshot, set[str]], list[Entity]
+    ],
+) -> None:
+    """Add entities for every device as it reports what it supports.
+
+    create_entities is called with each device's coordinator, its latest
+    snapshot and the keys already created for it, whenever the device
+    reports a different set of properties. It adds the keys of the
+    entities it returns to that set.
+    """
+    # Devices whose coordinator is already watched
+    watched: set[str] = set()
+
+    @callback
+    def _async_watch_device(device_coordinator: HinenDeviceCoordinator) -> None:
+        """Create entities for a device as it reports new properties."""
+        # Keys that already have an entity
+        known: set[str] = set()
+        # Layout and reported count of the last scanned snapshot, so polls
+        # reporting the same properties skip the scan
+        scanned: tuple[ModelLayout, int] | None = None
+
+        @callback
+        def _async_add_new_entities() -> None:
+            """Create entities not created yet."""
+            nonlocal scanned
+            if (snapshot := device_coordinator.snapshot) is None:
+                return
+            if (shape := (snapshot.layout, snapshot.reported_count)) == scanned:
+                return
+            scanned = shape
+            if entities := create_entities(device_coordinator, snapshot, known):
+                async_add_entities(entities)
+
+        _async_add_new_entities()
+        entry.async_on_unload(
+            device_coordinator.async_add_listener(_async_add_new_entities)
+        )
+
+    @callback
+    def _async_watch_new_devices() -> None:
+        """Start watching devices added to the inventory."""
+        for device_id, device_coordinator in coordinator.device_coordinators.items():
+            if device_id not in watched:
+                watched.add(device_id)
+                _async_watch_device(device_coordinator)
+
+    _async_watch_new_devices()
+    entry.async_on_unload(coordinator.async_add_listener(_async_watch_new_devices))
+
+
+class HinenEntity(CoordinatorEntity):
+    """Base class for Hinen Solar device entities."""
+
+    coordinator: HinenDeviceCoordinator
+
+    # Device properties the entity state is derived from
+    _property_ids: tuple[str, ...] = ()
+
+    def __init__(
+        self,
+        coordinator: HinenDeviceCoordinator,
+        description: EntityDescription,
+    ) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._device_id = device_id = coordinator.device_id
+
+        device_name = coordinator.device_name
+        self._attr_name = f"{device_name} {description.name}"
+        self._attr_unique_id = f"{device_id}_{description.key}"
+
+        # Set device info with unique identifier to avoid conflicts with official integration
+        device_data = coordinator.data or {}
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, f"{device_id}_advanced")},
+            "name": device_name,
+            "manufacturer": "Hinen",
+            "model": device_data.get("model_code", "Solar Inverter"),
+            "sw_version": device_data.get("firmware_version"),
+            "serial_number": device_data.get("serial_number"),
+        }
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available.
+
+        The last good data of a device is served through failed polls, so
+        the entity only becomes unavailable once that data is too old.
+        """
+        return self.coordinator.is_available
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only if the data this entity reads has changed."""
+        if self.coordinator.has_changed(self._property_ids):
+            super()._handle_coordinator_update()
+
+
+class HinenControlEntity(HinenEntity):
+    """Base class for entities that write a device property.
+
+    A new value is shown straight away and kept while the write is being
+    confirmed. Once the device reports the value the entity follows the
+    device again; if the write fails the previous value is restored.
+    """
+
+    def __init__(
+        self,
+        coordinator: HinenDeviceCoordinator,
+        description: EntityDescription,
+    ) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator, description)
+        self._property_ids = (description.key,)
+        self._accessor = PropertyAccessor(description.key)
+        self._optimistic_value: Any = None
+        # Increases with every write so only the latest one clears its value
+        self._write_generation = 0
+
+    @property
+    def current_value(self) -> Any:
+        """Return the value being written, or else the reported value."""
+        if self._optimistic_value is not None:
+            return self._optimistic_value
+        if (snapshot := self.coordinator.snapshot) is None:
+            return None
+        return self._accessor(snapshot)
+
+    async def _async_write_value(self, value: Any) -> None:
+        """Write a decoded value to the device property."""
+        snapshot = self.coordinator.snapshot
+        if snapshot is None:
+            raise HomeAssistantError(f"{self.name} has no data yet")
+        metadata = snapshot.layout.metadata[
+            snapshot.layout.resolve(self.entity_description.key)
+        ]
+
+        self._write_generation += 1
+        generation = self._write_generation
+        self._optimistic_value = value
+        self.async_write_ha_state()
+        try:
+            await self.coordinator.async_set_properties(
+                {self.entity_description.key: metadata.encode(value)}
+            )
+        except Exception as err:
+            raise HomeAssistantError(
+                f"Error setting {self.name} to {value}: {err}"
+            ) from err
+        finally:
+            if generation == self._write_generation:
+                # Confirmed or rolled back, show what the device reports
+                self._optimistic_value = None
+                self.async_write_ha_state()
@@ -0,0 +1,111 @@
+"""Lightweight timing and size metrics for Hinen Solar."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Sequence
+from typing import Any
+
+from .const import LATENCY_BUCKETS
+
+
+class Histogram:
+    """Fixed-bucket histogram of durations in seconds."""
+
+    __slots__ = ("bounds", "counts", "count", "total", "max", "last")
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        """Initialize an empty histogram."""
+        self.bounds = tuple(bounds)
+        # One count per bound plus one for values above the last bound
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last: float | None = None
+
+    def observe(self, value: float) -> None:
+        """Record a value."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.last = value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the upper bound of the bucket holding the given fraction."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram in milliseconds."""
+        buckets = {
+            f"le_{bound * 1000:g}ms": count
+            for bound, count in zip(self.bounds, self.counts)
+        }
+        buckets["over"] = self.counts[-1]
+
+        def _ms(value: float | None) -> float | None:
+            return None if value is None else round(value * 1000, 2)
+
+        return {
+            "count": self.count,
+            "last_ms": _ms(self.last),
+            "mean_ms": _ms(self.total / self.count) if self.count else None,
+            "p50_ms": _ms(self.percentile(0.5)),
+            "p95_ms": _ms(self.percentile(0.95)),
+            "max_ms": _ms(self.max) if self.count else None,
+            "buckets": buckets,
+        }
+
+
+class EndpointStats:
+    """Latency, response size and failure counters of one API endpoint."""
+
+    __slots__ = ("latency", "response_bytes", "last_response_bytes", "errors", "retries")
+
+    def __init__(self) -> None:
+        """Initialize empty counters."""
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.response_bytes = 0
+        self.last_response_bytes: int | None = None
+        self.errors = 0
+        self.retries = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters."""
+        count = self.latency.count
+        return {
+            "latency": self.latency.as_dict(),
+            "last_response_bytes": self.last_response_bytes,
+            "mean_response_bytes": round(self.response_bytes / count) if count else None,
+            "errors": self.errors,
+            "retries": self.retries,
+        }
+
+
+class ApiMetrics:
+    """Per-endpoint stats of an API client."""
+
+    __slots__ = ("endpoints",)
+
+    def __init__(self) -> None:
+        """Initialize without any endpoints."""
+        self.endpoints: dict[str, EndpointStats] = {}
+
+    def endpoint(self, name: str) -> EndpointStats:
+        """Return the stats of an endpoint, creating them on first use."""
+        if (stats := self.endpoints.get(name)) is None:
+            stats = self.endpoints[name] = EndpointStats()
+        return stats
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the stats of every endpoint used so far."""
+        return {name: stats.as_dict() for name, stats in self.endpoints.items()}
@@ -0,0 +1,379 @@
+"""Compact device property snapshots for Hinen Solar."""
+from __future__ import annotations
+
+import sys
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+# Marks a slot the device did not report in a snapshot
+_MISSING: Any = object()
+
+
+def coerce_value(value: Any) -> Any:
+    """Convert numeric strings from the API to int or float."""
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    return value
+
+
+def timestamp_to_seconds(timestamp: Any) -> float | None:
+    """Convert a device-side epoch timestamp (seconds or ms) to seconds."""
+    if isinstance(timestamp, str):
+        try:
+            timestamp = float(timestamp)
+        except ValueError:
+            return None
+    if not isinstance(timestamp, (int, float)) or isinstance(timestamp, bool):
+        return None
+    if timestamp > 1e11:
+        # Milliseconds
+        return timestamp / 1000
+    return float(timestamp)
+
+
+def newest_timestamp(properties: list[dict[str, Any]]) -> float | None:
+    """Return the newest property timestamp of a raw properties array."""
+    newest = None
+    for prop in properties:
+        seconds = timestamp_to_seconds(prop.get("timestamp"))
+        if seconds is not None and (newest is None or seconds > newest):
+            newest = seconds
+    return newest
+
+
+@dataclass(slots=True)
+class UploadTracker:
+    """Follows when a device uploads new data to the cloud.
+
+    The cadence is a smoothed estimate of the time between uploads. Gaps
+    spanning several uploads (polls slower than the device) are divided
+    down to a single period before they are folded in.
+    """
+
+    newest: float | None = None
+    cadence: float | None = None
+
+    def update(self, newest: float | None) -> bool:
+        """Record the newest timestamp of a poll; return True if it advanced."""
+        if newest is None:
+            # No timestamps to go by, treat every poll as new data
+            return True
+        if self.newest is not None and newest <= self.newest:
+            return False
+
+        if self.newest is not None:
+            delta = newest - self.newest
+            if self.cadence is None:
+                self.cadence = delta
+            else:
+                periods = max(1, round(delta / self.cadence))
+                self.cadence = 0.7 * self.cadence + 0.3 * (delta / periods)
+        self.newest = newest
+        return True
+
+    @property
+    def expected_next(self) -> float | None:
+        """Return the epoch time the next upload is expected at."""
+        if self.newest is None or self.cadence is None:
+            return None
+        return self.newest + self.cadence
+
+
+_INT_TYPES = {"int", "integer", "long"}
+_FLOAT_TYPES = {"float", "double", "decimal"}
+_BOOL_TYPES = {"bool", "boolean"}
+_TEXT_TYPES = {"text", "string", "date"}
+NUMERIC_DATATYPES = _INT_TYPES | _FLOAT_TYPES
+
+
+def _decode_bool(value: Any) -> bool:
+    """Decode a boolean sent as bool, number or string."""
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "on")
+    return bool(value)
+
+
+def _decode_int(value: Any) -> int | float:
+    """Decode an integer, keeping the fraction of values sent with one."""
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+def _spec_scale(specs: dict[str, Any]) -> int | float | None:
+    """Return the value multiplier given in specs, if it is a usable one."""
+    scale = specs.get("scale")
+    if not isinstance(scale, (int, float)) or isinstance(scale, bool) or scale in (0, 1):
+        return None
+    return scale
+
+
+def build_decoder(datatype: str | None, specs: Any) -> Callable[[Any], Any]:
+    """Build a value decoder from a property's datatype and specs.
+
+    Numbers are converted to int or float and multiplied by specs["scale"]
+    when one is given. Enum values are mapped to their label from specs.
+    Unknown datatypes fall back to coerce_value.
+    """
+    kind = (datatype or "").lower()
+    specs = specs if isinstance(specs, dict) else {}
+
+    if kind == "enum":
+        labels = {str(key): label for key, label in specs.items()}
+        return lambda value: labels.get(str(value), value)
+    if kind in _BOOL_TYPES:
+        return _decode_bool
+    if kind in _TEXT_TYPES:
+        return str
+
+    scale = _spec_scale(specs)
+
+    if kind in _INT_TYPES:
+        convert: Callable[[Any], Any] = _decode_int
+    elif kind in _FLOAT_TYPES:
+        convert = float
+    else:
+        convert = coerce_value
+
+    if scale is None:
+        return convert
+    return lambda value: convert(value) * scale
+
+
+@dataclass(slots=True)
+class PropertyMetadata:
+    """Static metadata of a property, shared by all devices of a model."""
+
+    identifier: str
+    name: str | None
+    datatype: str | None
+    specs: Any
+    reported: bool = False
+    access_mode: str | None = None
+    decoder: Callable[[Any], Any] = coerce_value
+
+    @property
+    def numeric(self) -> bool:
+        """Return True if the property holds a number."""
+        return (self.datatype or "").lower() in NUMERIC_DATATYPES
+
+    @property
+    def unit(self) -> str | None:
+        """Return the unit given in the specs, if any."""
+        if isinstance(self.specs, dict):
+            return self.specs.get("unit")
+        return None
+
+    @property
+    def writable(self) -> bool:
+        """Return True if the property can be set through the API."""
+        return "w" in (self.access_mode or "").lower()
+
+    def decode(self, value: Any) -> Any:
+        """Decode a raw API value, keeping it as-is if it does not parse."""
+        if value is None:
+            return None
+        try:
+            return self.decoder(value)
+        except (TypeError, ValueError):
+            return value
+
+    def encode(self, value: Any) -> Any:
+        """Convert a decoded value back to the raw value the API expects."""
+        kind = (self.datatype or "").lower()
+        specs = self.specs if isinstance(self.specs, dict) else {}
+        if kind == "enum":
+            for key, label in specs.items():
+                if label == value:
+                    return coerce_value(key)
+            return value
+        if kind in _BOOL_TYPES:
+            return int(bool(value))
+        if not isinstance(value, (int, float)):
+            return value
+        if (scale := _spec_scale(specs)) is not None:
+            value = value / scale
+        if kind in _INT_TYPES:
+            return int(round(value))
+        return value
+
+
+class ModelLayout:
+    """Property slots and metadata for one device model.
+
+    Slots are only ever appended, so an index handed out once stays valid
+    for the lifetime of the layout.
+    """
+
+    __slots__ = ("model_code", "index", "metadata")
+
+    def __init__(self, model_code: str | None) -> None:
+        """Initialize an empty layout."""
+        self.model_code = model_code
+        self.index: dict[str, int] = {}
+        self.metadata: list[PropertyMetadata] = []
+
+    def slot(self, prop: dict[str, Any]) -> int:
+        """Return the slot of a raw property, registering it on first sight."""
+        index = self.resolve(prop["identifier"])
+        metadata = self.metadata[index]
+        if not metadata.reported:
+            # First time the property is seen, capture its static metadata
+            metadata.name = prop.get("name")
+            metadata.datatype = prop.get("datatype")
+            metadata.specs = prop.get("specs")
+            metadata.access_mode = prop.get("accessMode")
+            metadata.decoder = build_decoder(metadata.datatype, metadata.specs)
+            metadata.reported = True
+        return index
+
+    def resolve(self, identifier: str) -> int:
+        """Return the slot of an identifier, reserving one if it is new."""
+        if (index := self.index.get(identifier)) is not None:
+            return index
+
+        identifier = sys.intern(identifier)
+        index = len(self.metadata)
+        self.metadata.append(PropertyMetadata(identifier, None, None, None))
+        self.index[identifier] = index
+        return index
+
+
+class PropertyAccessor:
+    """Reads one property from snapshots by slot index.
+
+    The identifier is resolved once per layout, so each read is a direct
+    list lookup.
+    """
+
+    __slots__ = ("identifier", "_layout", "_index")
+
+    def __init__(self, identifier: str) -> None:
+        """Initialize the accessor."""
+        self.identifier = identifier
+        self._layout: ModelLayout | None = None
+        self._index = 0
+
+    def __call__(self, snapshot: PropertySnapshot) -> Any | None:
+        """Return the property value from a snapshot."""
+        if snapshot.layout is not self._layout:
+            self._layout = snapshot.layout
+            self._index = snapshot.layout.resolve(self.identifier)
+        return snapshot.value_at(self._index)
+
+
+class PropertySnapshot:
+    """Property values and timestamps of one device from one poll."""
+
+    __slots__ = ("layout", "values", "timestamps", "reported_count")
+
+    def __init__(self, layout: ModelLayout) -> None:
+        """Initialize a snapshot with no reported properties."""
+        self.layout = layout
+        size = len(layout.metadata)
+        self.values: list[Any] = [_MISSING] * size
+        self.timestamps: list[Any] = [None] * size
+        # Number of properties reported in this snapshot
+        self.reported_count = 0
+
+    def copy(self) -> PropertySnapshot:
+        """Return a snapshot with the same layout and values."""
+        snapshot = PropertySnapshot.__new__(PropertySnapshot)
+        snapshot.layout = self.layout
+        snapshot.values = self.values.copy()
+        snapshot.timestamps = self.timestamps.copy()
+        snapshot.reported_count = self.reported_count
+        return snapshot
+
+    def set(self, index: int, value: Any, timestamp: Any) -> None:
+        """Store a reported value, growing with the layout if needed."""
+        if index >= len(self.values):
+            grow = index + 1 - len(self.values)
+            self.values.extend([_MISSING] * grow)
+            self.timestamps.extend([None] * grow)
+        if self.values[index] is _MISSING:
+            self.reported_count += 1
+        self.values[index] = value
+        self.timestamps[index] = timestamp
+
+    def value_at(self, index: int) -> Any | None:
+        """Return the value stored in a slot, or None if not reported."""
+        if index >= len(self.values):
+            return None
+        value = self.values[index]
+        return None if value is _MISSING else value
+
+    def get(self, identifier: str) -> Any | None:
+        """Return the value of a property, or None if not reported."""
+        index = self.layout.index.get(identifier)
+        if index is None:
+            return None
+        return self.value_at(index)
+
+    def timestamp(self, identifier: str) -> Any | None:
+        """Return the device-side timestamp of a property."""
+        index = self.layout.index.get(identifier)
+        if index is None or index >= len(self.timestamps):
+            return None
+        return self.timestamps[index]
+
+    def __contains__(self, identifier: object) -> bool:
+        """Return True if the property was reported in this snapshot."""
+        index = self.layout.index.get(identifier)  # type: ignore[arg-type]
+        return (
+            index is not None
+            and index < len(self.values)
+            and self.values[index] is not _MISSING
+        )
+
+    def reported(self) -> Iterator[PropertyMetadata]:
+        """Iterate over the metadata of properties reported in this snapshot."""
+        metadata = self.layout.metadata
+        for index, value in enumerate(self.values):
+            if value is not _MISSING:
+                yield metadata[index]
+
+    def identifiers(self) -> Iterator[str]:
+        """Iterate over the identifiers reported in this snapshot."""
+        metadata = self.layout.metadata
+        for index, value in enumerate(self.values):
+            if value is not _MISSING:
+                yield metadata[index].identifier
+
+    def changed(self, other: PropertySnapshot) -> set[str]:
+        """Return identifiers whose value differs from other.
+
+        A new upload of the same value is not a change, so it does not
+        cause a state write.
+        """
+        if other.layout is not self.layout:
+            return set(self.identifiers()) | set(other.identifiers())
+
+        metadata = self.layout.metadata
+        old_values = other.values
+        old_size = len(old_values)
+        changed = set()
+        for index in range(max(len(self.values), old_size)):
+            if index >= len(self.values):
+                if old_values[index] is not _MISSING:
+                    changed.add(metadata[index].identifier)
+            elif index >= old_size:
+                if self.values[index] is not _MISSING:
+                    changed.add(metadata[index].identifier)
+            elif self.values[index] != old_values[index]:
+                changed.add(metadata[index].identifier)
+        return changed
@@ -0,0 +1,91 @@
+"""Number platform for Hinen Solar."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.number import NumberEntity, NumberEntityDescription
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import EntityCategory
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN
+from .coordinator import HinenDataUpdateCoordinator, HinenDeviceCoordinator
+from .entity import HinenControlEntity, async_add_device_entities
+from .models import PropertyMetadata, PropertySnapshot
+
+
+def description_from_metadata(metadata: PropertyMetadata) -> NumberEntityDescription | None:
+    """Build a number description for a writable numeric property.
+
+    The range comes from the min and max in the property specs and is
+    scaled like the property values. Properties without a range get no
+    number entity.
+    """
+    specs = metadata.specs if isinstance(metadata.specs, dict) else {}
+    minimum = metadata.decode(specs.get("min"))
+    maximum = metadata.decode(specs.get("max"))
+    if not isinstance(minimum, (int, float)) or not isinstance(maximum, (int, float)):
+        return None
+
+    step = metadata.decode(specs.get("step"))
+    if not isinstance(step, (int, float)) or step <= 0:
+        step = 1
+
+    return NumberEntityDescription(
+        key=metadata.identifier,
+        name=metadata.name or metadata.identifier,
+        native_min_value=minimum,
+        native_max_value=maximum,
+        native_step=step,
+        native_unit_of_measurement=metadata.unit,
+        entity_category=EntityCategory.CONFIG,
+        entity_registry_enabled_default=False,
+    )
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Hinen Solar number based on a config entry."""
+    coordinator: HinenDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    @callback
+    def _async_create_numbers(
+        device_coordinator: HinenDeviceCoordinator,
+        snapshot: PropertySnapshot,
+        known: set[str],
+    ) -> list[HinenNumber]:
+        """Create numbers for writable numeric properties."""
+        entities: list[HinenNumber] = []
+        for metadata in snapshot.reported():
+            if (
+                metadata.identifier in known
+                or not metadata.writable
+                or not metadata.numeric
+            ):
+                continue
+            known.add(metadata.identifier)
+            if description := description_from_metadata(metadata):
+                entities.append(HinenNumber(device_coordinator, description))
+        return entities
+
+    async_add_device_entities(entry, coordinator, async_add_entities, _async_create_numbers)
+
+
+class HinenNumber(HinenControlEntity, NumberEntity):
+    """Representation of a writable Hinen Solar number property."""
+
+    entity_description: NumberEntityDescription
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the current value."""
+        value: Any = self.current_value
+        return value if isinstance(value, (int, float)) else None
+
+    async def async_set_native_value(self, value: float) -> None:
+        """Set a new value."""
+        await self._async_write_value(value)
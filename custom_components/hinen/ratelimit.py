@@ -0,0 +1,76 @@
+"""Process-wide client-side rate limiting for the Hinen Solar API."""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+from .const import RATE_LIMIT_BURST, RATE_LIMIT_PER_SECOND
+
+
+class TokenBucket:
+    """Token bucket limiter; waiters are served in arrival order."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Initialize a full bucket."""
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.queue_depth = 0
+        self.acquired = 0
+        self.delayed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _refill(self) -> None:
+        """Add tokens for the time elapsed since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """Take one token, waiting if needed; return the seconds waited."""
+        start = time.monotonic()
+        self.queue_depth += 1
+        try:
+            async with self._lock:
+                self._refill()
+                if self._tokens < 1:
+                    await asyncio.sleep((1 - self._tokens) / self.rate)
+                    self._refill()
+                self._tokens -= 1
+        finally:
+            self.queue_depth -= 1
+
+        waited = time.monotonic() - start
+        self.acquired += 1
+        if waited > 0.001:
+            self.delayed += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+        return waited
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return queue depth and wait time counters."""
+        return {
+            "queue_depth": self.queue_depth,
+            "acquired": self.acquired,
+            "delayed": self.delayed,
+            "total_wait": round(self.total_wait, 3),
+            "max_wait": round(self.max_wait, 3),
+        }
+
+
+# One bucket per (host, client_id), shared by every config entry in the process
+_LIMITERS: dict[tuple[str, str], TokenBucket] = {}
+
+
+def get_rate_limiter(host: str, client_id: str) -> TokenBucket:
+    """Return the shared limiter for a host and client ID."""
+    key = (host, client_id)
+    if (limiter := _LIMITERS.get(key)) is None:
+        limiter = _LIMITERS[key] = TokenBucket(RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST)
+    return limiter
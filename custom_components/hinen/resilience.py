@@ -0,0 +1,101 @@
+"""Retry and circuit breaker helpers for the Hinen Solar API client."""
+from __future__ import annotations
+
+import logging
+import random
+import time
+
+from .const import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_MAX_RESET_TIMEOUT,
+    CIRCUIT_RESET_TIMEOUT,
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_MAX,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+def backoff_delay(attempt: int) -> float:
+    """Return a full-jitter exponential backoff delay for a retry attempt."""
+    return random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2**attempt))
+
+
+class CircuitBreaker:
+    """Stops calls to the cloud while it keeps failing.
+
+    After CIRCUIT_FAILURE_THRESHOLD consecutive transient failures the
+    circuit opens and requests are rejected without touching the network.
+    Once the reset timeout has passed a single probe request is let through;
+    its outcome closes the circuit or opens it again with a longer timeout.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a closed circuit."""
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.times_opened = 0
+        self._reset_timeout: float = CIRCUIT_RESET_TIMEOUT
+        self._opened_at = 0.0
+        self._probe_started = 0.0
+
+    @property
+    def retry_after(self) -> float:
+        """Return seconds until an open circuit lets a probe through."""
+        if self.state != STATE_OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self._reset_timeout - time.monotonic())
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent now."""
+        if self.state == STATE_CLOSED:
+            return True
+        now = time.monotonic()
+        if (self.state == STATE_OPEN and self.retry_after == 0) or (
+            # A probe that never reported back must not block forever
+            self.state == STATE_HALF_OPEN
+            and now - self._probe_started >= self._reset_timeout
+        ):
+            _LOGGER.debug("Circuit half-open, probing the API")
+            self.state = STATE_HALF_OPEN
+            self._probe_started = now
+            return True
+        # Open, or half-open with the probe still in flight
+        return False
+
+    def record_success(self) -> None:
+        """Record a request that reached the API."""
+        if self.state != STATE_CLOSED:
+            _LOGGER.info("Hinen API reachable again, circuit closed")
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self._reset_timeout = CIRCUIT_RESET_TIMEOUT
+
+    def record_failure(self) -> None:
+        """Record a transient failure."""
+        self.consecutive_failures += 1
+        if self.state == STATE_HALF_OPEN:
+            # Probe failed, back off further before the next one
+            self._reset_timeout = min(self._reset_timeout * 2, CIRCUIT_MAX_RESET_TIMEOUT)
+            self._open()
+        elif (
+            self.state == STATE_CLOSED
+            and self.consecutive_failures >= CIRCUIT_FAILURE_THRESHOLD
+        ):
+            self._open()
+
+    def _open(self) -> None:
+        """Open the circuit."""
+        if self.state == STATE_CLOSED:
+            _LOGGER.warning(
+                "Hinen API failed %d times in a row, pausing requests for %ss",
+                self.consecutive_failures,
+                self._reset_timeout,
+            )
+        self.state = STATE_OPEN
+        self.times_opened += 1
+        self._opened_at = time.monotonic()
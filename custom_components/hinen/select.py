@@ -0,0 +1,80 @@
+"""Select platform for Hinen Solar."""
+from __future__ import annotations
+
+from homeassistant.components.select import SelectEntity, SelectEntityDescription
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import EntityCategory
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN
+from .coordinator import HinenDataUpdateCoordinator, HinenDeviceCoordinator
+from .entity import HinenControlEntity, async_add_device_entities
+from .models import PropertyMetadata, PropertySnapshot
+
+
+def description_from_metadata(metadata: PropertyMetadata) -> SelectEntityDescription | None:
+    """Build a select description for a writable enum property.
+
+    The options are the labels from the property specs.
+    """
+    if (metadata.datatype or "").lower() != "enum" or not isinstance(
+        metadata.specs, dict
+    ):
+        return None
+    options = [str(label) for label in metadata.specs.values()]
+    if not options:
+        return None
+
+    return SelectEntityDescription(
+        key=metadata.identifier,
+        name=metadata.name or metadata.identifier,
+        options=options,
+        entity_category=EntityCategory.CONFIG,
+        entity_registry_enabled_default=False,
+    )
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Hinen Solar select based on a config entry."""
+    coordinator: HinenDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    @callback
+    def _async_create_selects(
+        device_coordinator: HinenDeviceCoordinator,
+        snapshot: PropertySnapshot,
+        known: set[str],
+    ) -> list[HinenSelect]:
+        """Create selects for writable enum properties."""
+        entities: list[HinenSelect] = []
+        for metadata in snapshot.reported():
+            if metadata.identifier in known or not metadata.writable:
+                continue
+            known.add(metadata.identifier)
+            if description := description_from_metadata(metadata):
+                entities.append(HinenSelect(device_coordinator, description))
+        return entities
+
+    async_add_device_entities(entry, coordinator, async_add_entities, _async_create_selects)
+
+
+class HinenSelect(HinenControlEntity, SelectEntity):
+    """Representation of a writable Hinen Solar enum property."""
+
+    entity_description: SelectEntityDescription
+
+    @property
+    def current_option(self) -> str | None:
+        """Return the selected option."""
+        value = self.current_value
+        if value is None or str(value) not in self.options:
+            return None
+        return str(value)
+
+    async def async_select_option(self, option: str) -> None:
+        """Select an option."""
+        await self._async_write_value(option)
@@ -20,14 +20,22 @@ from homeassistant.const import (
     UnitOfFrequency,
     UnitOfPower,
     UnitOfTemperature,
+    UnitOfTime,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
-from .coordinator import HinenDataUpdateCoordinator
+from .const import DOMAIN, ENERGY_CHANNELS
+from .coordinator import HinenDataUpdateCoordinator, HinenDeviceCoordinator
+from .energy import EnergyIntegrator
+from .entity import HinenEntity, async_add_device_entities
+from .metrics import Histogram
+from .models import (
+    PropertyAccessor,
+    PropertyMetadata,
+    PropertySnapshot,
+)
 
 
 @dataclass
@@ -291,6 +299,125 @@ SENSOR_DESCRIPTIONS: tuple[HinenSensorEntityDescription, ...] = (
 )
 
 
+# Device class, unit and state class for units found in property specs
+SPEC_UNITS: dict[str, tuple[SensorDeviceClass | None, str, SensorStateClass]] = {
+    "W": (SensorDeviceClass.POWER, UnitOfPower.WATT, SensorStateClass.MEASUREMENT),
+    "kW": (SensorDeviceClass.POWER, UnitOfPower.KILO_WATT, SensorStateClass.MEASUREMENT),
+    "V": (
+        SensorDeviceClass.VOLTAGE,
+        UnitOfElectricPotential.VOLT,
+        SensorStateClass.MEASUREMENT,
+    ),
+    "A": (
+        SensorDeviceClass.CURRENT,
+        UnitOfElectricCurrent.AMPERE,
+        SensorStateClass.MEASUREMENT,
+    ),
+    "Hz": (
+        SensorDeviceClass.FREQUENCY,
+        UnitOfFrequency.HERTZ,
+        SensorStateClass.MEASUREMENT,
+    ),
+    "Wh": (
+        SensorDeviceClass.ENERGY,
+        UnitOfEnergy.WATT_HOUR,
+        SensorStateClass.TOTAL_INCREASING,
+    ),
+    "kWh": (
+        SensorDeviceClass.ENERGY,
+        UnitOfEnergy.KILO_WATT_HOUR,
+        SensorStateClass.TOTAL_INCREASING,
+    ),
+    "°C": (
+        SensorDeviceClass.TEMPERATURE,
+        UnitOfTemperature.CELSIUS,
+        SensorStateClass.MEASUREMENT,
+    ),
+    "℃": (
+        SensorDeviceClass.TEMPERATURE,
+        UnitOfTemperature.CELSIUS,
+        SensorStateClass.MEASUREMENT,
+    ),
+    "%": (None, PERCENTAGE, SensorStateClass.MEASUREMENT),
+}
+
+DESCRIPTIONS_BY_KEY = {description.key: description for description in SENSOR_DESCRIPTIONS}
+
+
+@dataclass
+class HinenDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Describes Hinen timing diagnostic sensor entity."""
+
+    histogram_fn: Callable[[HinenDeviceCoordinator], Histogram] | None = None
+
+
+# Timing of the update pipeline of each device, for telling a slow cloud
+# apart from slow parsing or a slow state machine
+DIAGNOSTIC_SENSOR_DESCRIPTIONS: tuple[HinenDiagnosticSensorEntityDescription, ...] = (
+    HinenDiagnosticSensorEntityDescription(
+        key="request_latency",
+        name="Request Latency",
+        histogram_fn=lambda coordinator: coordinator.latency_histogram,
+    ),
+    HinenDiagnosticSensorEntityDescription(
+        key="parse_time",
+        name="Parse Time",
+        histogram_fn=lambda coordinator: coordinator.parse_histogram,
+    ),
+    HinenDiagnosticSensorEntityDescription(
+        key="fanout_time",
+        name="Update Fan-out Time",
+        histogram_fn=lambda coordinator: coordinator.fanout_histogram,
+    ),
+)
+
+# Energy integrated locally from power samples, keyed by energy channel
+ENERGY_SENSOR_DESCRIPTIONS: dict[str, HinenSensorEntityDescription] = {
+    channel: HinenSensorEntityDescription(
+        key=f"local_energy_{channel}",
+        name=name,
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=3,
+    )
+    for channel, name in (
+        ("pv_generation", "PV Generation Energy (Local)"),
+        ("consumption", "Consumption Energy (Local)"),
+        ("grid_feed_in", "Grid Feed-in Energy (Local)"),
+        ("energy_purchased", "Energy Purchased (Local)"),
+        ("charging", "Charging Energy (Local)"),
+        ("discharging", "Discharging Energy (Local)"),
+    )
+}
+
+
+def description_from_metadata(metadata: PropertyMetadata) -> HinenSensorEntityDescription:
+    """Build a description for a property without a hand-written one.
+
+    These entities are disabled by default, users can enable the ones they
+    want from the entity registry.
+    """
+    device_class = None
+    unit = None
+    state_class = None
+    if metadata.numeric:
+        state_class = SensorStateClass.MEASUREMENT
+        if (spec_unit := metadata.unit) in SPEC_UNITS:
+            device_class, unit, state_class = SPEC_UNITS[spec_unit]
+        else:
+            unit = spec_unit
+
+    return HinenSensorEntityDescription(
+        key=metadata.identifier,
+        name=metadata.name or metadata.identifier,
+        device_class=device_class,
+        native_unit_of_measurement=unit,
+        state_class=state_class,
+        entity_registry_enabled_default=False,
+    )
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -299,53 +426,67 @@ async def async_setup_entry(
     """Set up Hinen Solar sensor based on a config entry."""
     coordinator: HinenDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    entities: list[HinenSensor] = []
+    @callback
+    def _async_create_sensors(
+        device_coordinator: HinenDeviceCoordinator,
+        snapshot: PropertySnapshot,
+        known: set[str],
+    ) -> list[HinenSensor]:
+        """Create sensors for properties reported for the first time."""
+        entities: list[HinenSensor] = []
+        for metadata in snapshot.reported():
+            if metadata.identifier in known:
+                continue
+            known.add(metadata.identifier)
+
+            description = DESCRIPTIONS_BY_KEY.get(
+                metadata.identifier
+            ) or description_from_metadata(metadata)
+            entities.append(HinenSensor(device_coordinator, description))
 
-    # Create sensors for each device
-    for device_id in coordinator.devices:
-        for description in SENSOR_DESCRIPTIONS:
-            entities.append(HinenSensor(coordinator, device_id, description))
+        for description in DIAGNOSTIC_SENSOR_DESCRIPTIONS:
+            if description.key not in known:
+                known.add(description.key)
+                entities.append(HinenDiagnosticSensor(device_coordinator, description))
 
-    async_add_entities(entities)
+        for channel in EnergyIntegrator.supported(snapshot):
+            description = ENERGY_SENSOR_DESCRIPTIONS[channel]
+            if description.key not in known:
+                known.add(description.key)
+                entities.append(
+                    HinenEnergySensor(device_coordinator, description, channel)
+                )
+        return entities
 
+    # Only create sensors for properties the devices actually report, and
+    # pick up new ones (new devices or firmware) as they appear
+    async_add_device_entities(
+        entry, coordinator, async_add_entities, _async_create_sensors
+    )
 
-class HinenSensor(CoordinatorEntity, SensorEntity):
+
+class HinenSensor(HinenEntity, SensorEntity):
     """Representation of a Hinen Solar sensor."""
 
     entity_description: HinenSensorEntityDescription
 
     def __init__(
         self,
-        coordinator: HinenDataUpdateCoordinator,
-        device_id: str,
+        coordinator: HinenDeviceCoordinator,
         description: HinenSensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self.entity_description = description
-        self._device_id = device_id
-
-        device_name = coordinator.get_device_name(device_id)
-        self._attr_name = f"{device_name} {description.name}"
-        self._attr_unique_id = f"{device_id}_{description.key}"
-
-        # Set device info with unique identifier to avoid conflicts with official integration
-        device_data = coordinator.devices.get(device_id, {})
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, f"{device_id}_advanced")},
-            "name": device_name,
-            "manufacturer": "Hinen",
-            "model": device_data.get("model_code", "Solar Inverter"),
-            "sw_version": device_data.get("firmware_version"),
-            "serial_number": device_data.get("serial_number"),
-        }
+        super().__init__(coordinator, description)
+        self._property_ids = (description.key,)
+        self._accessor = PropertyAccessor(description.key)
 
     @property
     def native_value(self) -> Any:
         """Return the state of the sensor."""
-        value = self.coordinator.get_device_property(
-            self._device_id, self.entity_description.key
-        )
+        snapshot = self.coordinator.snapshot
+        if snapshot is None:
+            return None
+        value = self._accessor(snapshot)
 
         # Return None if value doesn't exist
         if value is None:
@@ -357,11 +498,92 @@ class HinenSensor(CoordinatorEntity, SensorEntity):
 
         return value
 
+
+class HinenEnergySensor(HinenEntity, SensorEntity):
+    """Energy integrated locally from a device's power readings."""
+
+    entity_description: HinenSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: HinenDeviceCoordinator,
+        description: HinenSensorEntityDescription,
+        channel: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, description)
+        self._channel = channel
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the integrated energy."""
+        return self.coordinator.energy.value(self._channel)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state when the energy of the channel moved.
+
+        Energy keeps growing while power readings stay the same, so this
+        does not go by the changed properties.
+        """
+        if (
+            self._channel in self.coordinator.changed_energy
+            or self.coordinator.has_changed(())
+        ):
+            self.async_write_ha_state()
+
+
+class HinenDiagnosticSensor(HinenEntity, SensorEntity):
+    """Timing of one stage of a device's update pipeline."""
+
+    entity_description: HinenDiagnosticSensorEntityDescription
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_suggested_display_precision = 2
+
+    def __init__(
+        self,
+        coordinator: HinenDeviceCoordinator,
+        description: HinenDiagnosticSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, description)
+        # Availability and observation count of the last written state
+        self._written: tuple[bool, int] | None = None
+
     @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        if not super().available:
-            return False
+    def _histogram(self) -> Histogram:
+        """Return the histogram this sensor reports."""
+        return self.entity_description.histogram_fn(self.coordinator)
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the latest duration in milliseconds."""
+        return self._histogram.as_dict()["last_ms"]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the distribution of the duration."""
+        return self._histogram.as_dict()
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to updates outside the timed listener fan-out."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_metrics_listener(self._async_write_metrics)
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Ignore the regular fan-out, see _async_write_metrics."""
 
-        # Check if the device exists in coordinator data
-        return self._device_id in self.coordinator.devices
+    @callback
+    def _async_write_metrics(self) -> None:
+        """Write state when a duration was recorded or availability changed."""
+        state = (self.available, self._histogram.count)
+        if state != self._written:
+            self._written = state
+            self.async_write_ha_state()
@@ -0,0 +1,266 @@
+"""Hourly long-term statistics for Hinen Solar energy counters."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import (
+    DOMAIN,
+    ENERGY_COUNTER_PROPERTIES,
+    STATISTICS_IMPORT_CHUNK,
+    STATISTICS_IMPORT_INTERVAL,
+    STATISTICS_SAVE_DELAY,
+    STATISTICS_STORAGE_VERSION,
+)
+from .coordinator import HinenDataUpdateCoordinator, HinenDeviceCoordinator
+from .models import timestamp_to_seconds
+
+_LOGGER = logging.getLogger(__name__)
+
+HOUR = 3600
+
+
+def statistic_id(device_id: str, property_id: str) -> str:
+    """Return the external statistic ID of a device counter."""
+    return f"{DOMAIN}:{slugify(f'{device_id}_{property_id}')}"
+
+
+class StatisticsImporter:
+    """Imports the energy counters of all devices as hourly statistics.
+
+    The API has no history endpoint, so history is built from what the
+    polls see: the last counter value of every hour, stamped with the
+    device-side property timestamp. Samples are kept in a Store until
+    their hour has been imported, so hours collected while the recorder
+    was busy or Home Assistant was restarting are imported later. Hours
+    without a sample, e.g. during an outage, are backfilled once the
+    device reports again by spreading the counter increase over them in
+    proportion to time. Import resumes after the last imported hour of
+    each statistic, and re-importing an hour overwrites the same row.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        coordinator: HinenDataUpdateCoordinator,
+    ) -> None:
+        """Initialize the importer."""
+        self._hass = hass
+        self._coordinator = coordinator
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STATISTICS_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.statistics"
+        )
+        # Per statistic: name, unit, pending hourly samples (hour start ->
+        # counter value and device time), the last imported hour and sample
+        # and the running sum state
+        self._statistics: dict[str, dict[str, Any]] = {}
+        self._watched: set[str] = set()
+        self._unsubs: list[CALLBACK_TYPE] = []
+        self._lock = asyncio.Lock()
+
+    async def async_start(self) -> None:
+        """Load the checkpoint, start collecting and import pending hours."""
+        if "recorder" not in self._hass.config.components:
+            _LOGGER.debug("Recorder not loaded, not importing energy statistics")
+            return
+
+        if stored := await self._store.async_load():
+            self._statistics = stored.get("statistics", {})
+
+        self._async_watch_new_devices()
+        self._unsubs.append(
+            self._coordinator.async_add_listener(self._async_watch_new_devices)
+        )
+        self._unsubs.append(
+            async_track_time_interval(
+                self._hass,
+                self._async_import_interval,
+                timedelta(seconds=STATISTICS_IMPORT_INTERVAL),
+            )
+        )
+        self._hass.async_create_task(self.async_import())
+
+    async def async_stop(self) -> None:
+        """Stop collecting and save pending samples."""
+        while self._unsubs:
+            self._unsubs.pop()()
+        if self._statistics:
+            await self._store.async_save(self._data_to_save())
+
+    @callback
+    def _async_watch_new_devices(self) -> None:
+        """Start recording counters of devices added to the inventory."""
+        for device_id, device_coordinator in self._coordinator.device_coordinators.items():
+            if device_id in self._watched:
+                continue
+            self._watched.add(device_id)
+
+            record = partial(self._async_record, device_coordinator)
+            record()
+            self._unsubs.append(device_coordinator.async_add_listener(record))
+
+    @callback
+    def _async_record(self, device_coordinator: HinenDeviceCoordinator) -> None:
+        """Record the latest counter values of a device in their hour."""
+        if (snapshot := device_coordinator.snapshot) is None:
+            return
+
+        recorded = False
+        for property_id in ENERGY_COUNTER_PROPERTIES:
+            value = snapshot.get(property_id)
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                continue
+            seconds = timestamp_to_seconds(snapshot.timestamp(property_id))
+            if seconds is None:
+                seconds = dt_util.utcnow().timestamp()
+            hour = int(seconds // HOUR * HOUR)
+
+            stat = self._statistics.setdefault(
+                statistic_id(device_coordinator.device_id, property_id),
+                {
+                    "hours": {},
+                    "imported": None,
+                    "last_value": None,
+                    "last_seconds": None,
+                    "offset": 0.0,
+                },
+            )
+            stat["name"] = f"{device_coordinator.device_name} {property_id}"
+            stat["unit"] = (
+                snapshot.layout.metadata[snapshot.layout.index[property_id]].unit
+                or UnitOfEnergy.KILO_WATT_HOUR
+            )
+            if stat["imported"] is not None and hour <= stat["imported"]:
+                # Already imported
+                continue
+            stat["hours"][str(hour)] = [value, seconds]
+            recorded = True
+
+        if recorded:
+            self._store.async_delay_save(self._data_to_save, STATISTICS_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to store."""
+        return {"statistics": self._statistics}
+
+    async def _async_import_interval(self, now: datetime) -> None:
+        """Import completed hours on the import interval."""
+        await self.async_import()
+
+    async def async_import(self) -> None:
+        """Import every completed hour not imported yet, in chunks."""
+        # Imported here, the recorder is only an after-dependency
+        from homeassistant.components.recorder.models import (
+            StatisticData,
+            StatisticMetaData,
+        )
+        from homeassistant.components.recorder.statistics import (
+            async_add_external_statistics,
+        )
+
+        async with self._lock:
+            # Only hours that have ended; the current one may still change
+            current_hour = int(dt_util.utcnow().timestamp() // HOUR * HOUR)
+            imported = 0
+
+            # Copied, devices may add statistics while a chunk is saved
+            for stat_id, stat in list(self._statistics.items()):
+                hours = sorted(
+                    int(hour) for hour in stat["hours"] if int(hour) < current_hour
+                )
+                if not hours:
+                    continue
+
+                metadata = StatisticMetaData(
+                    has_mean=False,
+                    has_sum=True,
+                    name=stat.get("name"),
+                    source=DOMAIN,
+                    statistic_id=stat_id,
+                    unit_of_measurement=stat.get("unit"),
+                )
+                rows: list[StatisticData] = []
+                for hour in hours:
+                    value, seconds = stat["hours"].pop(str(hour))
+                    for missed, estimate in self._backfill(stat, hour, value, seconds):
+                        rows.append(
+                            StatisticData(
+                                start=dt_util.utc_from_timestamp(missed),
+                                state=estimate,
+                                sum=estimate + stat["offset"],
+                            )
+                        )
+                    if stat["last_value"] is not None and value < stat["last_value"]:
+                        # Counter reset on the device, keep the sum increasing
+                        stat["offset"] += stat["last_value"]
+                    stat["last_value"] = value
+                    stat["last_seconds"] = seconds
+                    rows.append(
+                        StatisticData(
+                            start=dt_util.utc_from_timestamp(hour),
+                            state=value,
+                            sum=value + stat["offset"],
+                        )
+                    )
+                    stat["imported"] = hour
+
+                    if len(rows) < STATISTICS_IMPORT_CHUNK and hour != hours[-1]:
+                        continue
+                    # Queued to the recorder thread; each chunk is one job.
+                    # A long backfill may span several chunks.
+                    for start in range(0, len(rows), STATISTICS_IMPORT_CHUNK):
+                        async_add_external_statistics(
+                            self._hass,
+                            metadata,
+                            rows[start : start + STATISTICS_IMPORT_CHUNK],
+                        )
+                    imported += len(rows)
+                    rows = []
+                    await self._store.async_save(self._data_to_save())
+                    # Let other work run between chunks
+                    await asyncio.sleep(0)
+
+            if imported:
+                _LOGGER.debug("Imported %d hourly energy statistics", imported)
+
+    @staticmethod
+    def _backfill(
+        stat: dict[str, Any], hour: int, value: float, seconds: float
+    ) -> list[tuple[int, float]]:
+        """Return estimated counter values of the hours missed before a sample.
+
+        The increase since the last imported sample is spread over the
+        missed hours by time, using the device-side timestamps. Nothing is
+        estimated across a counter reset.
+        """
+        last_value = stat["last_value"]
+        last_seconds = stat.get("last_seconds")
+        if (
+            stat["imported"] is None
+            or last_value is None
+            or last_seconds is None
+            or value < last_value
+            or seconds <= last_seconds
+        ):
+            return []
+
+        span = seconds - last_seconds
+        rate = (value - last_value) / span
+        estimates = []
+        for missed in range(stat["imported"] + HOUR, hour, HOUR):
+            # Counter value at the end of the missed hour
+            elapsed = min(max(missed + HOUR - last_seconds, 0), span)
+            estimates.append((missed, last_value + rate * elapsed))
+        return estimates
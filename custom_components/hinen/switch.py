@@ -0,0 +1,77 @@
+"""Switch platform for Hinen Solar."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import EntityCategory
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN
+from .coordinator import HinenDataUpdateCoordinator, HinenDeviceCoordinator
+from .entity import HinenControlEntity, async_add_device_entities
+from .models import PropertyMetadata, PropertySnapshot
+
+
+def description_from_metadata(metadata: PropertyMetadata) -> SwitchEntityDescription:
+    """Build a switch description for a writable boolean property."""
+    return SwitchEntityDescription(
+        key=metadata.identifier,
+        name=metadata.name or metadata.identifier,
+        entity_category=EntityCategory.CONFIG,
+        entity_registry_enabled_default=False,
+    )
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Hinen Solar switch based on a config entry."""
+    coordinator: HinenDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    @callback
+    def _async_create_switches(
+        device_coordinator: HinenDeviceCoordinator,
+        snapshot: PropertySnapshot,
+        known: set[str],
+    ) -> list[HinenSwitch]:
+        """Create switches for writable boolean properties."""
+        entities: list[HinenSwitch] = []
+        for metadata in snapshot.reported():
+            if (
+                metadata.identifier in known
+                or not metadata.writable
+                or (metadata.datatype or "").lower() not in ("bool", "boolean")
+            ):
+                continue
+            known.add(metadata.identifier)
+            entities.append(
+                HinenSwitch(device_coordinator, description_from_metadata(metadata))
+            )
+        return entities
+
+    async_add_device_entities(entry, coordinator, async_add_entities, _async_create_switches)
+
+
+class HinenSwitch(HinenControlEntity, SwitchEntity):
+    """Representation of a writable Hinen Solar boolean property."""
+
+    entity_description: SwitchEntityDescription
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return true if the switch is on."""
+        value = self.current_value
+        return None if value is None else bool(value)
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        """Turn the switch on."""
+        await self._async_write_value(True)
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        """Turn the switch off."""
+        await self._async_write_value(False)
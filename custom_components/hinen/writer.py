@@ -0,0 +1,116 @@
+"""Coalesced property writes for Hinen Solar devices."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant
+
+from .api import HinenWriteError
+from .const import WRITE_COALESCE_WINDOW, WRITE_VERIFY_ATTEMPTS, WRITE_VERIFY_DELAY
+
+if TYPE_CHECKING:
+    from .coordinator import HinenDeviceCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PropertyWriter:
+    """Sends property changes of one device in batches.
+
+    Changes requested within the coalesce window are merged into a single
+    property_set call; a later value for the same property wins. Values
+    the device already reports are dropped, and the written properties
+    are read back until the device reports them.
+    """
+
+    def __init__(self, hass: HomeAssistant, coordinator: HinenDeviceCoordinator) -> None:
+        """Initialize the writer."""
+        self._hass = hass
+        self._coordinator = coordinator
+        self._pending: dict[str, Any] = {}
+        self._waiters: list[asyncio.Future[None]] = []
+        self._flush_task: asyncio.Task[None] | None = None
+        # One batch on the wire at a time, so batches apply in order
+        self._lock = asyncio.Lock()
+        self.batches = 0
+        self.coalesced = 0
+        self.skipped = 0
+
+    async def async_write(self, properties: dict[str, Any]) -> None:
+        """Queue property changes and wait until the device confirmed them."""
+        self._pending.update(properties)
+        waiter: asyncio.Future[None] = self._hass.loop.create_future()
+        self._waiters.append(waiter)
+        if self._flush_task is None:
+            self._flush_task = self._hass.async_create_task(self._async_flush())
+        await waiter
+
+    async def _async_flush(self) -> None:
+        """Send the changes collected during the coalesce window."""
+        await asyncio.sleep(WRITE_COALESCE_WINDOW)
+        pending, self._pending = self._pending, {}
+        waiters, self._waiters = self._waiters, []
+        self._flush_task = None
+
+        try:
+            async with self._lock:
+                await self._async_write_batch(pending, len(waiters))
+        except Exception as err:
+            # Every caller in the batch gets the error
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(err)
+        else:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    async def _async_write_batch(self, pending: dict[str, Any], requests: int) -> None:
+        """Write one batch and verify it by reading it back."""
+        coordinator = self._coordinator
+        changes = {
+            identifier: value
+            for identifier, value in pending.items()
+            if not coordinator.reports_value(identifier, value)
+        }
+        self.skipped += len(pending) - len(changes)
+        if not changes:
+            _LOGGER.debug("Device %s already reports %s", coordinator.device_id, pending)
+            return
+
+        self.batches += 1
+        self.coalesced += requests - 1
+        _LOGGER.debug(
+            "Writing %s to device %s (%d requests coalesced)",
+            changes,
+            coordinator.device_id,
+            requests,
+        )
+        await coordinator.fleet.api.async_set_device_property(
+            coordinator.device_id, changes
+        )
+
+        unconfirmed = set(changes)
+        for _ in range(WRITE_VERIFY_ATTEMPTS):
+            await asyncio.sleep(WRITE_VERIFY_DELAY)
+            unconfirmed = await coordinator.async_read_back(
+                {identifier: changes[identifier] for identifier in unconfirmed}
+            )
+            if not unconfirmed:
+                return
+
+        raise HinenWriteError(
+            f"Device {coordinator.device_id} did not confirm "
+            f"{', '.join(sorted(unconfirmed))}"
+        )
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return batch counters."""
+        return {
+            "batches": self.batches,
+            "coalesced": self.coalesced,
+            "skipped": self.skipped,
+        }